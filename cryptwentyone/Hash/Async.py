@@ -0,0 +1,95 @@
+# cryptwentyone.Hash.Async.py
+# CodeWriter21
+
+import os as _os
+import asyncio as _asyncio
+import inspect as _inspect
+import threading as _threading
+
+from concurrent.futures import Executor as _Executor, ThreadPoolExecutor as _ThreadPoolExecutor
+from typing import Union as _Union, Type as _Type, Optional as _Optional, AsyncIterator as _AsyncIterator, Any as _Any
+
+from .Hash import Hash, get_algorithm
+
+__all__ = ['ahash']
+
+# The amount of data handed to the executor at once.
+DEFAULT_BATCH_SIZE = 1 << 16  # 64 KiB
+# The size of the reads from streams that have a `read` coroutine.
+READ_SIZE = 1 << 16  # 64 KiB
+
+_executor: _Optional[_Executor] = None
+_executor_lock = _threading.Lock()
+
+
+def _default_executor() -> _Executor:
+    """
+    Returns the shared, bounded thread pool used by `ahash`.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = _ThreadPoolExecutor(max_workers=min(4, _os.cpu_count() or 1),
+                                            thread_name_prefix='cryptwentyone-ahash')
+        return _executor
+
+
+async def _chunks(stream: _Any) -> _AsyncIterator[bytes]:
+    """
+    Iterates over the chunks of an asyncio/aiohttp-style reader(anything with a `read(n)` coroutine) or of an async
+    iterable of bytes-like objects.
+    """
+    read = getattr(stream, 'read', None)
+    if read is not None and _inspect.iscoroutinefunction(read):
+        while True:
+            chunk = await read(READ_SIZE)
+            if not chunk:
+                return
+            yield chunk
+    else:
+        async for chunk in stream:
+            yield chunk
+
+
+async def ahash(stream: _Any, algorithm: _Union[str, _Type[Hash]] = 'sha256', executor: _Optional[_Executor] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> Hash:
+    """
+    Hashes an async stream without blocking the event loop.
+
+    Full blocks are hashed in batches on a thread pool while the next chunks are being read. The partial block is
+    carried over to the next batch, and reading pauses while a batch is waiting for the previous one, so at most about
+    two batches are held in memory.
+
+    :param stream: An asyncio/aiohttp-style reader(with a `read(n)` coroutine) or an async iterable of bytes-like
+        objects.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param executor: The thread pool to hash on, a shared pool of up to 4 threads by default.
+    :param batch_size: The amount of data handed to the executor at once.
+    :return: The hash object of the stream content.
+    """
+    hasher = get_algorithm(algorithm)()
+    if executor is None:
+        executor = _default_executor()
+    loop = _asyncio.get_running_loop()
+    block_size = hasher.block_size
+    batch_size = max(batch_size - batch_size % block_size, block_size)
+
+    carry = bytearray()
+    pending: _Optional[_asyncio.Future] = None
+    async for chunk in _chunks(stream):
+        carry += chunk
+        if len(carry) < batch_size:
+            continue
+        end = len(carry) - len(carry) % block_size
+        batch = bytes(carry[:end])
+        del carry[:end]
+        # The hash object is updated by one batch at a time, waiting here also stops reading(backpressure).
+        if pending is not None:
+            await pending
+        pending = loop.run_in_executor(executor, hasher.update, batch)
+
+    if pending is not None:
+        await pending
+    if carry:
+        await loop.run_in_executor(executor, hasher.update, bytes(carry))
+    return hasher
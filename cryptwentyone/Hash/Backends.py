@@ -0,0 +1,249 @@
+# cryptwentyone.Hash.Backends.py
+# CodeWriter21
+
+# new(name, data, backend='auto') creates a hash object using one of the registered backends:
+#
+#   reference   The readable implementation of the *Python classes(`reference=True`)
+#   python      The *Python classes with the generated kernels
+#   hashlib     The standard library, wrapped in the same Hash interface, where the algorithm is available
+#
+# 'auto' picks the fastest backend for the algorithm and the size of the initial data. The backends are measured on a
+# few message sizes the first time an algorithm is used, or the measurements are read from the calibration file named
+# by the CRYPTWENTYONE_CALIBRATION environment variable(see `calibrate`).
+
+import os as _os
+import json as _json
+import time as _time
+import hashlib as _hashlib
+import platform as _platform
+import threading as _threading
+
+from typing import Union as _Union, Type as _Type, Callable as _Callable, Dict as _Dict, List as _List, \
+    Optional as _Optional, NamedTuple as _NamedTuple, Sequence as _Sequence
+
+from .Hash import Hash, get_algorithm, _Message, _algorithms
+
+__all__ = ['new', 'register_backend', 'available_backends', 'calibrate']
+
+# The calibration measures messages of these sizes, a message uses the measurement of the largest size not above it.
+SIZE_BUCKETS = [0, 64, 1 << 10, 16 << 10]
+# Every backend is run this many times per size, the best time counts.
+CALIBRATION_ROUNDS = 3
+CALIBRATION_FILE: _Optional[str] = _os.environ.get('CRYPTWENTYONE_CALIBRATION')
+
+
+class _Backend(_NamedTuple):
+    # Creates the hash object: factory(hash class, initial data)
+    factory: _Callable[[_Type[Hash], _Message], Hash]
+    # Tells whether the backend supports an algorithm
+    supports: _Callable[[_Type[Hash]], bool]
+
+
+_backends: _Dict[str, _Backend] = {}
+# The fastest backend by algorithm name and size bucket.
+_choices: _Dict[str, _List[str]] = {}
+_lock = _threading.Lock()
+
+
+def register_backend(name: str, factory: _Callable[[_Type[Hash], _Message], Hash],
+                     supports: _Callable[[_Type[Hash]], bool] = lambda cls: True) -> None:
+    """
+    Adds a backend to the registry(or replaces one with the same name). The automatic choices are measured again.
+
+    :param name: The name of the backend.
+    :param factory: Creates the hash object from the hash class and the initial data, the object must give the same
+        digests as the hash class.
+    :param supports: Tells whether the backend supports a hash class.
+    """
+    with _lock:
+        _backends[name] = _Backend(factory, supports)
+        _choices.clear()
+
+
+def available_backends(algorithm: _Union[str, _Type[Hash]]) -> _List[str]:
+    """
+    Lists the backends that support an algorithm.
+
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :return: The names of the backends.
+    """
+    cls = get_algorithm(algorithm)
+    return [name for name, backend in _backends.items() if backend.supports(cls)]
+
+
+def _environment() -> _Dict[str, str]:
+    return {
+        'python': _platform.python_version(),
+        'implementation': _platform.python_implementation(),
+        'machine': _platform.machine(),
+        'backends': ','.join(sorted(_backends)),
+    }
+
+
+def _measure(cls: _Type[Hash]) -> _List[str]:
+    """
+    Finds the fastest backend of an algorithm for every size bucket.
+    """
+    names = available_backends(cls)
+    choices = []
+    for size in SIZE_BUCKETS:
+        data = _os.urandom(size)
+        times = {}
+        for name in names:
+            factory = _backends[name].factory
+            best = float('inf')
+            for _ in range(CALIBRATION_ROUNDS):
+                start = _time.perf_counter()
+                factory(cls, data).digest()
+                best = min(best, _time.perf_counter() - start)
+            times[name] = best
+        choices.append(min(times, key=times.get))
+    return choices
+
+
+def _load(path: str) -> None:
+    try:
+        with open(path) as file:
+            calibration = _json.load(file)
+    except (OSError, ValueError):
+        return
+    if calibration.get('environment') != _environment() or calibration.get('sizes') != SIZE_BUCKETS:
+        return
+    for name, choices in calibration.get('choices', {}).items():
+        if all(choice in _backends for choice in choices):
+            _choices.setdefault(name, choices)
+
+
+def _save(path: str) -> None:
+    directory = _os.path.dirname(path)
+    if directory:
+        _os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as file:
+        _json.dump({'environment': _environment(), 'sizes': SIZE_BUCKETS, 'choices': _choices}, file, indent=2)
+
+
+def calibrate(algorithms: _Optional[_Sequence[_Union[str, _Type[Hash]]]] = None,
+              path: _Optional[str] = None) -> _Dict[str, _Dict[int, str]]:
+    """
+    Measures the backends of the algorithms again and optionally saves the results, which `new` reads when the
+    CRYPTWENTYONE_CALIBRATION environment variable names the file.
+
+    :param algorithms: The names of the algorithms or Hash subclasses, every algorithm by default.
+    :param path: The calibration file to write.
+    :return: The fastest backend by algorithm name and message size.
+    """
+    classes = [get_algorithm(algorithm) for algorithm in (algorithms or list(_algorithms.values()))]
+    with _lock:
+        for cls in classes:
+            _choices[cls.name] = _measure(cls)
+        if path is not None:
+            _save(path)
+        return {cls.name: dict(zip(SIZE_BUCKETS, _choices[cls.name])) for cls in classes}
+
+
+def _choose(cls: _Type[Hash], size: int) -> str:
+    choices = _choices.get(cls.name)
+    if choices is None:
+        with _lock:
+            if CALIBRATION_FILE and not _choices:
+                _load(CALIBRATION_FILE)
+            choices = _choices.get(cls.name)
+            if choices is None:
+                choices = _choices[cls.name] = _measure(cls)
+                if CALIBRATION_FILE:
+                    try:
+                        _save(CALIBRATION_FILE)
+                    except OSError:
+                        pass
+    bucket = 0
+    for i, bucket_size in enumerate(SIZE_BUCKETS):
+        if size >= bucket_size:
+            bucket = i
+    return choices[bucket]
+
+
+def new(name: _Union[str, _Type[Hash]], data: _Message = b'', backend: str = 'auto') -> Hash:
+    """
+    Creates a hash object, like `hashlib.new`.
+
+    :param name: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param data: The initial data.
+    :param backend: The name of the backend('reference', 'python', 'hashlib' or a registered one), 'auto' picks the
+        fastest one for the size of the initial data.
+    :return: The hash object, every backend has the same digests and the same Hash interface.
+    """
+    cls = get_algorithm(name)
+    if backend == 'auto':
+        backend = _choose(cls, len(Hash._as_view(data)))
+    try:
+        selected = _backends[backend]
+    except KeyError:
+        raise ValueError(f"Unknown backend: {backend!r}") from None
+    if not selected.supports(cls):
+        raise ValueError(f"The {backend!r} backend does not support {cls.name}")
+    return selected.factory(cls, data)
+
+
+def _hashlib_supports(cls: _Type[Hash]) -> bool:
+    try:
+        _hashlib.new(cls.name)
+    except ValueError:
+        return False
+    return True
+
+
+_hashlib_classes: _Dict[_Type[Hash], _Type[Hash]] = {}
+# Separate from `_lock`, which is held while the factories are measured
+_hashlib_classes_lock = _threading.Lock()
+
+
+def _hashlib_class(cls: _Type[Hash]) -> _Type[Hash]:
+    """
+    Returns a subclass of a hash class that computes the digests with hashlib.
+    """
+    klass = _hashlib_classes.get(cls)
+    if klass is not None:
+        return klass
+    with _hashlib_classes_lock:
+        # Another thread may have created it in the meantime, every hash class has a single hashlib subclass
+        return _hashlib_classes.get(cls) or _create_hashlib_class(cls)
+
+
+def _create_hashlib_class(cls: _Type[Hash]) -> _Type[Hash]:
+
+    class _HashlibHash(cls):
+        __slots__ = ('_object',)
+
+        def _initialize_variables(self):
+            super()._initialize_variables()
+            self._object = _hashlib.new(self.name)
+
+        def _update(self, message: _Message) -> None:
+            view = self._as_view(message)
+            self._length += len(view)
+            if self.instrumentation is not None:
+                self.instrumentation.record_bytes(self, len(view))
+            self._object.update(view)
+
+        def _process_blocks(self, data) -> None:
+            self._object.update(data)
+
+        def _get_state(self):
+            raise TypeError("The hashlib backend does not expose its state")
+
+        def copy(self) -> Hash:
+            other = super().copy()
+            other._object = self._object.copy()
+            return other
+
+        def _hash(self) -> bytes:
+            return self._object.digest()
+
+    _HashlibHash.__name__ = _HashlibHash.__qualname__ = cls.__name__.replace('Python', '') + 'Hashlib'
+    klass = _hashlib_classes[cls] = _HashlibHash
+    return klass
+
+
+register_backend('reference', lambda cls, data: cls(data, reference=True))
+register_backend('python', lambda cls, data: cls(data))
+register_backend('hashlib', lambda cls, data: _hashlib_class(cls)(data), _hashlib_supports)
@@ -0,0 +1,521 @@
+# cryptwentyone.Hash.Batch.py
+# CodeWriter21
+
+import os as _os
+import functools as _functools
+
+from typing import Union as _Union, Type as _Type, Iterable as _Iterable, List as _List, Dict as _Dict, \
+    Callable as _Callable, Tuple as _Tuple, Optional as _Optional
+
+from .Hash import Hash, get_algorithm
+from .Parallel import create_executor
+from .MD5 import MD5Python, K as _MD5_K, s as _MD5_S
+from .SHA1 import SHA1Python, K as _SHA1_K
+from .SHA2 import _SHA2Python, _SHA2Python64, SHA224Python, SHA256Python, SHA384Python, SHA512Python, \
+    SHA512_224Python, SHA512_256Python
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+__all__ = ['hash_many']
+
+# Groups with fewer messages are hashed one by one, the array overhead is not worth it for them.
+MIN_LANES = 4
+# Groups with more messages are split to keep the arrays small.
+MAX_LANES = 1 << 16
+# The SWAR engine packs at most this many messages into one integer.
+MAX_SWAR_LANES = 1024
+
+
+def _to_bytes(message) -> bytes:
+    if isinstance(message, bytes):
+        return message
+    return Hash._as_view(message).tobytes()
+
+
+def _hash_many_python(cls: _Type[Hash], messages: _List[bytes]) -> _List[bytes]:
+    """
+    Hashes the messages one by one.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :return: The digests of the messages.
+    """
+    return [cls(message).digest() for message in messages]
+
+
+def _rotl(x, n: int):
+    return (x << n) | (x >> (32 - n))
+
+
+def _rotr(x, n: int):
+    return (x >> n) | (x << (32 - n))
+
+
+def _rotr64(x, n: int):
+    return (x >> n) | (x << (64 - n))
+
+
+def _md5_numpy(state: list, w: list) -> list:
+    """
+    Runs the MD5 compression function on all the lanes of a block at once.
+
+    :param state: The a0, b0, c0 and d0 arrays.
+    :param w: The sixteen message word arrays of the block.
+    :return: The new state.
+    """
+    a, b, c, d = state
+    for i in range(64):
+        if i <= 15:
+            temp = (b & c) | (~b & d)
+            g = i
+        elif i <= 31:
+            temp = (d & b) | (~d & c)
+            g = (5 * i + 1) % 16
+        elif i <= 47:
+            temp = b ^ c ^ d
+            g = (3 * i + 5) % 16
+        else:
+            temp = c ^ (b | ~d)
+            g = (7 * i) % 16
+        temp = temp + a + _MD5_K32[i] + w[g]
+        a = d
+        d = c
+        c = b
+        b = b + _rotl(temp, _MD5_S[i])
+    return [state[0] + a, state[1] + b, state[2] + c, state[3] + d]
+
+
+def _sha1_numpy(state: list, w: list) -> list:
+    """
+    Runs the SHA1 compression function on all the lanes of a block at once.
+
+    :param state: The h0..h4 arrays.
+    :param w: The sixteen message word arrays of the block.
+    :return: The new state.
+    """
+    w = list(w)
+    for i in range(16, 80):
+        w.append(_rotl(w[i - 3] ^ w[i - 8] ^ w[i - 14] ^ w[i - 16], 1))
+
+    a, b, c, d, e = state
+    for i in range(80):
+        if i <= 19:
+            temp = (b & c) | (~b & d)
+        elif i <= 39:
+            temp = b ^ c ^ d
+        elif i <= 59:
+            temp = (b & c) | (b & d) | (c & d)
+        else:
+            temp = b ^ c ^ d
+        temp = _rotl(a, 5) + temp + e + _SHA1_K32[i // 20] + w[i]
+        e = d
+        d = c
+        c = _rotl(b, 30)
+        b = a
+        a = temp
+    return [x + y for x, y in zip(state, (a, b, c, d, e))]
+
+
+def _sha256_numpy(state: list, w: list) -> list:
+    """
+    Runs the SHA256 compression function on all the lanes of a block at once.
+
+    :param state: The h0..h7 arrays.
+    :param w: The sixteen message word arrays of the block.
+    :return: The new state.
+    """
+    w = list(w)
+    for i in range(16, 64):
+        s0 = _rotr(w[i - 15], 7) ^ _rotr(w[i - 15], 18) ^ (w[i - 15] >> 3)
+        s1 = _rotr(w[i - 2], 17) ^ _rotr(w[i - 2], 19) ^ (w[i - 2] >> 10)
+        w.append(w[i - 16] + s0 + w[i - 7] + s1)
+
+    a, b, c, d, e, f, g, h = state
+    for i in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g)
+        temp1 = h + s1 + ch + _SHA256_K32[i] + w[i]
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        temp2 = s0 + maj
+        h = g
+        g = f
+        f = e
+        e = d + temp1
+        d = c
+        c = b
+        b = a
+        a = temp1 + temp2
+    return [x + y for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+def _sha512_numpy(state: list, w: list) -> list:
+    """
+    Runs the SHA512 compression function on all the lanes of a block at once.
+
+    :param state: The h0..h7 arrays.
+    :param w: The sixteen message word arrays of the block.
+    :return: The new state.
+    """
+    w = list(w)
+    for i in range(16, 80):
+        s0 = _rotr64(w[i - 15], 1) ^ _rotr64(w[i - 15], 8) ^ (w[i - 15] >> 7)
+        s1 = _rotr64(w[i - 2], 19) ^ _rotr64(w[i - 2], 61) ^ (w[i - 2] >> 6)
+        w.append(w[i - 16] + s0 + w[i - 7] + s1)
+
+    a, b, c, d, e, f, g, h = state
+    for i in range(80):
+        s1 = _rotr64(e, 14) ^ _rotr64(e, 18) ^ _rotr64(e, 41)
+        ch = (e & f) ^ (~e & g)
+        temp1 = h + s1 + ch + _SHA512_K64[i] + w[i]
+        s0 = _rotr64(a, 28) ^ _rotr64(a, 34) ^ _rotr64(a, 39)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        temp2 = s0 + maj
+        h = g
+        g = f
+        f = e
+        e = d + temp1
+        d = c
+        c = b
+        b = a
+        a = temp1 + temp2
+    return [x + y for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+
+if _np is not None:
+    _MD5_K32 = [_np.uint32(k) for k in _MD5_K]
+    _SHA1_K32 = [_np.uint32(k) for k in _SHA1_K]
+    _SHA256_K32 = [_np.uint32(k) for k in _SHA2Python.k]
+    _SHA512_K64 = [_np.uint64(k) for k in _SHA2Python64.k]
+
+# Maps every hash class supported by the NumPy engine to its compression function.
+_NUMPY_COMPRESS: _Dict[_Type[Hash], _Callable[[list, list], list]] = {
+    MD5Python: _md5_numpy,
+    SHA1Python: _sha1_numpy,
+    SHA224Python: _sha256_numpy,
+    SHA256Python: _sha256_numpy,
+    SHA384Python: _sha512_numpy,
+    SHA512Python: _sha512_numpy,
+    SHA512_224Python: _sha512_numpy,
+    SHA512_256Python: _sha512_numpy,
+}
+
+
+def _hash_group_numpy(cls: _Type[Hash], messages: _List[bytes], n_blocks: int) -> _List[bytes]:
+    """
+    Hashes messages that have the same number of padded blocks, one lane per message.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :param n_blocks: The number of padded blocks of every message.
+    :return: The digests of the messages.
+    """
+    # Every block holds sixteen 32 or 64-bit words
+    word_size = cls.block_size // 16
+    word_type = _np.uint32 if word_size == 4 else _np.uint64
+    dtype = ('<u' if cls.length_byteorder == 'little' else '>u') + str(word_size)
+    padded = b''.join(message + cls._padding(len(message)) for message in messages)
+    # Shape: (block, word, lane), so that every word of a block is a contiguous array of lanes.
+    words = _np.frombuffer(padded, dtype=dtype).reshape(len(messages), n_blocks, 16)
+    words = _np.ascontiguousarray(words.astype(word_type).transpose(1, 2, 0))
+
+    compress = _NUMPY_COMPRESS[cls]
+    state = [_np.full(len(messages), h, dtype=word_type) for h in cls()._get_state()]
+    for block in words:
+        state = compress(state, block)
+
+    # Every row holds the digest of one message, followed by the rest of its last word for truncated digests
+    n_words = -(-cls.digest_size // word_size)
+    row_size = n_words * word_size
+    digests = _np.stack(state[:n_words], axis=1).astype(dtype).tobytes()
+    return [digests[i:i + cls.digest_size] for i in range(0, len(digests), row_size)]
+
+
+def _hash_groups(cls: _Type[Hash], messages: _List[bytes], hash_group: _Callable[[_Type[Hash], _List[bytes], int],
+                 _List[bytes]], max_lanes: int) -> _List[bytes]:
+    """
+    Groups the messages by their number of padded blocks and hashes every group at once.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :param hash_group: Hashes a group: hash_group(cls, messages, n_blocks).
+    :param max_lanes: The maximum number of messages in a group, larger groups are split.
+    :return: The digests of the messages.
+    """
+    groups: _Dict[int, _List[int]] = {}
+    for index, message in enumerate(messages):
+        groups.setdefault((len(message) + cls.length_size) // cls.block_size + 1, []).append(index)
+
+    digests: _List[bytes] = [b''] * len(messages)
+    for n_blocks, indexes in groups.items():
+        for start in range(0, len(indexes), max_lanes):
+            part = indexes[start:start + max_lanes]
+            group = [messages[i] for i in part]
+            if len(group) < MIN_LANES:
+                results = _hash_many_python(cls, group)
+            else:
+                results = hash_group(cls, group, n_blocks)
+            for index, digest in zip(part, results):
+                digests[index] = digest
+    return digests
+
+
+def _hash_many_numpy(cls: _Type[Hash], messages: _List[bytes]) -> _List[bytes]:
+    """
+    Hashes the messages on uint32(uint64 for the SHA512 family) NumPy arrays, running the compression function on all
+    the messages with the same number of padded blocks at once.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :return: The digests of the messages.
+    """
+    if _np is None:
+        raise ImportError("The numpy engine requires NumPy to be installed")
+    if cls not in _NUMPY_COMPRESS:
+        raise ValueError(f"The numpy engine does not support {cls.name!r}")
+    return _hash_groups(cls, messages, _hash_group_numpy, MAX_LANES)
+
+
+# SWAR(SIMD within a register): the words of several messages are packed into one Python integer, each lane twice as
+# wide as a word so the upper half is a guard for the carries of the additions. Every operand is kept clean(zero guard
+# bits) by masking with `m` after the shifts and the sums, so the lanes never interfere.
+
+def _md5_swar(state: list, w: list, m: int, k: list) -> list:
+    """
+    Runs the MD5 compression function on all the lanes of packed integers.
+
+    :param state: The packed a0, b0, c0 and d0.
+    :param w: The sixteen packed message words of the block.
+    :param m: The word mask of every lane.
+    :param k: The packed round constants.
+    :return: The new state.
+    """
+    a, b, c, d = state
+    for i in range(64):
+        if i <= 15:
+            temp = d ^ (b & (c ^ d))
+            g = i
+        elif i <= 31:
+            temp = c ^ (d & (b ^ c))
+            g = (5 * i + 1) % 16
+        elif i <= 47:
+            temp = b ^ c ^ d
+            g = (3 * i + 5) % 16
+        else:
+            temp = c ^ (b | (d ^ m))
+            g = (7 * i) % 16
+        temp = (temp + a + k[i] + w[g]) & m
+        shift = _MD5_S[i]
+        a, d, c = d, c, b
+        b = (b + (((temp << shift) | (temp >> (32 - shift))) & m)) & m
+    return [(x + y) & m for x, y in zip(state, (a, b, c, d))]
+
+
+def _sha1_swar(state: list, w: list, m: int, k: list) -> list:
+    """
+    Runs the SHA1 compression function on all the lanes of packed integers.
+
+    :param state: The packed h0..h4.
+    :param w: The sixteen packed message words of the block.
+    :param m: The word mask of every lane.
+    :param k: The packed round constants.
+    :return: The new state.
+    """
+    w = list(w)
+    for i in range(16, 80):
+        x = w[i - 3] ^ w[i - 8] ^ w[i - 14] ^ w[i - 16]
+        w.append(((x << 1) | (x >> 31)) & m)
+
+    a, b, c, d, e = state
+    for i in range(80):
+        if i <= 19:
+            f = d ^ (b & (c ^ d))
+        elif i <= 39 or i >= 60:
+            f = b ^ c ^ d
+        else:
+            f = (b & c) | (d & (b | c))
+        temp = ((((a << 5) | (a >> 27)) & m) + f + e + k[i // 20] + w[i]) & m
+        a, b, c, d, e = temp, a, ((b << 30) | (b >> 2)) & m, c, d
+    return [(x + y) & m for x, y in zip(state, (a, b, c, d, e))]
+
+
+def _sha2_swar(bits: int, big_sigma0: _Tuple[int, int, int], big_sigma1: _Tuple[int, int, int],
+               small_sigma0: _Tuple[int, int, int], small_sigma1: _Tuple[int, int, int]) -> _Callable:
+    """
+    Returns the compression function of a SHA2 family working on all the lanes of packed integers.
+
+    :param bits: The size of a word(32 or 64).
+    :return: compress(state, w, m, k), see `_sha1_swar`.
+    """
+
+    def compress(state: list, w: list, m: int, k: list) -> list:
+        def rotr(x: int, n: int) -> int:
+            return ((x >> n) | (x << (bits - n))) & m
+
+        w = list(w)
+        for i in range(16, len(k)):
+            x, y = w[i - 15], w[i - 2]
+            s0 = rotr(x, small_sigma0[0]) ^ rotr(x, small_sigma0[1]) ^ ((x >> small_sigma0[2]) & m)
+            s1 = rotr(y, small_sigma1[0]) ^ rotr(y, small_sigma1[1]) ^ ((y >> small_sigma1[2]) & m)
+            w.append((w[i - 16] + s0 + w[i - 7] + s1) & m)
+
+        a, b, c, d, e, f, g, h = state
+        for i in range(len(k)):
+            s1 = rotr(e, big_sigma1[0]) ^ rotr(e, big_sigma1[1]) ^ rotr(e, big_sigma1[2])
+            temp1 = h + s1 + (g ^ (e & (f ^ g))) + k[i] + w[i]
+            s0 = rotr(a, big_sigma0[0]) ^ rotr(a, big_sigma0[1]) ^ rotr(a, big_sigma0[2])
+            temp2 = s0 + ((a & b) | (c & (a | b)))
+            a, b, c, d, e, f, g, h = (temp1 + temp2) & m, a, b, c, (d + temp1) & m, e, f, g
+        return [(x + y) & m for x, y in zip(state, (a, b, c, d, e, f, g, h))]
+
+    return compress
+
+
+_sha256_swar = _sha2_swar(32, (2, 13, 22), (6, 11, 25), (7, 18, 3), (17, 19, 10))
+_sha512_swar = _sha2_swar(64, (28, 34, 39), (14, 18, 41), (1, 8, 7), (19, 61, 6))
+
+# Maps every hash class supported by the SWAR engine to its compression function and its round constants.
+_SWAR_COMPRESS: _Dict[_Type[Hash], _Tuple[_Callable, _List[int]]] = {
+    MD5Python: (_md5_swar, _MD5_K),
+    SHA1Python: (_sha1_swar, _SHA1_K),
+    SHA224Python: (_sha256_swar, _SHA2Python.k),
+    SHA256Python: (_sha256_swar, _SHA2Python.k),
+    SHA384Python: (_sha512_swar, _SHA2Python64.k),
+    SHA512Python: (_sha512_swar, _SHA2Python64.k),
+    SHA512_224Python: (_sha512_swar, _SHA2Python64.k),
+    SHA512_256Python: (_sha512_swar, _SHA2Python64.k),
+}
+
+
+@_functools.lru_cache(maxsize=64)
+def _swar_constants(cls: _Type[Hash], lanes: int) -> _Tuple[int, int, _List[int]]:
+    """
+    Returns the packed constants of a hash class.
+
+    :return: The integer with a 1 in every lane, the word mask of every lane and the packed round constants.
+    """
+    word_size = cls.block_size // 16
+    ones = int.from_bytes((b'\x01' + b'\x00' * (2 * word_size - 1)) * lanes, 'little')
+    return ones, ((1 << (word_size * 8)) - 1) * ones, [k * ones for k in _SWAR_COMPRESS[cls][1]]
+
+
+def _hash_group_swar(cls: _Type[Hash], messages: _List[bytes], n_blocks: int) -> _List[bytes]:
+    """
+    Hashes messages that have the same number of padded blocks, one lane of the packed integers per message.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :param n_blocks: The number of padded blocks of every message.
+    :return: The digests of the messages.
+    """
+    word_size = cls.block_size // 16
+    word_format = 'I' if word_size == 4 else 'Q'
+    byteorder = cls.length_byteorder
+    lanes = len(messages)
+    padded = [message + cls._padding(len(message)) for message in messages]
+    # The first message is the lowest lane: the first one in little-endian integers, the last one in big-endian ones.
+    if byteorder == 'big':
+        padded.reverse()
+    words = memoryview(b''.join(padded)).cast(word_format)
+    stride = n_blocks * 16
+
+    # A word and its guard in every lane, the guard comes first in big-endian integers
+    packed = bytearray(2 * word_size * lanes)
+    slots = memoryview(packed).cast(word_format)[1 if byteorder == 'big' else 0::2]
+
+    ones, m, k = _swar_constants(cls, lanes)
+    compress = _SWAR_COMPRESS[cls][0]
+    state = [h * ones for h in cls()._get_state()]
+    for block in range(n_blocks):
+        w = []
+        for t in range(16):
+            slots[:] = words[block * 16 + t::stride]
+            w.append(int.from_bytes(packed, byteorder))
+        state = compress(state, w, m, k)
+
+    # Every row holds the digest of one message, followed by the rest of its last word for truncated digests
+    n_words = -(-cls.digest_size // word_size)
+    rows = bytearray(n_words * word_size * lanes)
+    rows_view = memoryview(rows).cast(word_format)
+    for i in range(n_words):
+        packed[:] = state[i].to_bytes(len(packed), byteorder)
+        rows_view[i::n_words] = slots
+    row_size = n_words * word_size
+    digests = [bytes(rows[i:i + cls.digest_size]) for i in range(0, len(rows), row_size)]
+    if byteorder == 'big':
+        digests.reverse()
+    return digests
+
+
+def _hash_many_swar(cls: _Type[Hash], messages: _List[bytes]) -> _List[bytes]:
+    """
+    Hashes the messages with the words of up to `MAX_SWAR_LANES` messages packed into every Python integer, running
+    the compression function on all of them at once. It needs no third-party packages.
+
+    :param cls: The hash class.
+    :param messages: The messages to hash.
+    :return: The digests of the messages.
+    """
+    if cls not in _SWAR_COMPRESS:
+        raise ValueError(f"The swar engine does not support {cls.name!r}")
+    return _hash_groups(cls, messages, _hash_group_swar, MAX_SWAR_LANES)
+
+
+# Maps the name of every engine to a function that hashes a list of messages with a hash class.
+_engines: _Dict[str, _Callable[[_Type[Hash], _List[bytes]], _List[bytes]]] = {
+    'python': _hash_many_python,
+    'numpy': _hash_many_numpy,
+    'swar': _hash_many_swar,
+}
+
+
+def _auto_engine(cls: _Type[Hash]) -> str:
+    if _np is not None and cls in _NUMPY_COMPRESS:
+        return 'numpy'
+    if cls in _SWAR_COMPRESS:
+        return 'swar'
+    return 'python'
+
+
+def hash_many(messages: _Iterable[_Union[str, bytes]], algorithm: _Union[str, _Type[Hash]] = 'sha256',
+              engine: str = 'auto', workers: _Optional[int] = 1, executor: str = 'auto') -> _List[bytes]:
+    """
+    Hashes many independent messages at once.
+
+    :param messages: The messages to hash(strings or bytes-like objects).
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param engine: 'numpy' hashes the messages in parallel lanes of NumPy arrays and 'swar' in parallel lanes packed
+        into Python integers(the built-in algorithms only), 'python' hashes them one by one and 'auto' picks the
+        fastest available engine for the algorithm.
+    :param workers: The number of workers the messages are split across, None for the number of CPUs. 1 hashes them
+        in this thread.
+    :param executor: The kind of workers: 'thread', 'process' or 'auto'(threads on free-threaded Python builds,
+        processes when the GIL is enabled).
+    :return: The digests of the messages in the same order.
+    """
+    cls = get_algorithm(algorithm)
+    messages = [_to_bytes(message) for message in messages]
+    if engine == 'auto':
+        engine = _auto_engine(cls)
+    try:
+        function = _engines[engine]
+    except KeyError:
+        raise ValueError(f"Unknown engine: {engine!r}") from None
+    if workers is None:
+        workers = _os.cpu_count() or 1
+    workers = min(workers, len(messages))
+    if workers <= 1:
+        return function(cls, messages)
+
+    # Raises the errors of the engine(a missing package, an unsupported algorithm) before starting the workers
+    function(cls, [])
+    digests: _List[bytes] = [b''] * len(messages)
+    with create_executor(executor, workers) as pool:
+        # Every worker gets every n-th message, so the sizes are spread evenly across them
+        futures = [pool.submit(function, cls, messages[i::workers]) for i in range(workers)]
+        for i, future in enumerate(futures):
+            digests[i::workers] = future.result()
+    return digests
@@ -0,0 +1,234 @@
+# cryptwentyone.Hash.Cache.py
+# CodeWriter21
+
+import os as _os
+import sqlite3 as _sqlite3
+import functools as _functools
+import threading as _threading
+
+from typing import Union as _Union, Type as _Type, Tuple as _Tuple, Optional as _Optional
+
+from .Hash import Hash, get_algorithm, DEFAULT_CHUNK_SIZE
+
+__all__ = ['DigestCache', 'file_identity']
+
+# Identifies a version of a file: (device, inode, size, mtime_ns).
+_Identity = _Tuple[int, int, int, int]
+
+# Uncommitted changes are written to the database after this many lookups and stores.
+COMMIT_INTERVAL = 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS digests (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest BLOB NOT NULL,
+    used INTEGER NOT NULL,
+    PRIMARY KEY (device, inode, algorithm)
+);
+CREATE INDEX IF NOT EXISTS digests_used ON digests (used);
+"""
+
+
+def file_identity(stat: _os.stat_result) -> _Identity:
+    """
+    Returns the identity of a file version as used by the cache.
+
+    :param stat: The result of `os.stat` or `os.fstat`.
+    :return: (device, inode, size, mtime_ns).
+    """
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+@_functools.lru_cache(maxsize=None)
+def _cached_class(cls: _Type[Hash]) -> _Type[Hash]:
+    """
+    Returns a read-only subclass of a hash class, holding a digest read from the cache.
+    """
+
+    class _CachedHash(cls):
+        __slots__ = ()
+
+        def update(self, message) -> None:
+            raise TypeError("A digest read from the cache cannot be updated")
+
+        def update_file(self, file, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+            raise TypeError("A digest read from the cache cannot be updated")
+
+        def _update_mmap(self, file) -> None:
+            raise TypeError("A digest read from the cache cannot be updated")
+
+        def export_state(self) -> bytes:
+            raise TypeError("A digest read from the cache has no state")
+
+        def _hash(self) -> bytes:
+            return self._digest
+
+    _CachedHash.__name__ = _CachedHash.__qualname__ = 'Cached' + cls.__name__
+    return _CachedHash
+
+
+class DigestCache:
+    """
+    A persistent cache of file digests in an SQLite database, so hashing an unchanged file again costs a stat instead
+    of reading the whole file.
+
+    The entries are keyed on the device, the inode and the algorithm, and are only used while the size and the
+    modification time of the file still match. Only the digests are stored, never any of the file content. The least
+    recently used entries are evicted once there are more than `max_entries` of them.
+
+    Changes are committed every `COMMIT_INTERVAL` operations and by `flush` and `close`, use the cache as a context
+    manager to make sure everything is written.
+    """
+
+    def __init__(self, path: _Union[str, _os.PathLike], max_entries: int = 1 << 20):
+        """
+        :param path: The path of the database file, it is created if it does not exist.
+        :param max_entries: The maximum number of cached digests.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path: str = _os.fspath(path)
+        self.max_entries: int = max_entries
+        self.hits: int = 0
+        self.misses: int = 0
+        self._lock = _threading.Lock()
+        self._connection = _sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._connection.executescript(_SCHEMA)
+        self._count: int = self._connection.execute('SELECT COUNT(*) FROM digests').fetchone()[0]
+        self._used: int = self._connection.execute('SELECT COALESCE(MAX(used), 0) FROM digests').fetchone()[0]
+        self._changes: int = 0
+
+    def _changed(self) -> None:
+        self._changes += 1
+        if self._changes >= COMMIT_INTERVAL:
+            self._connection.commit()
+            self._changes = 0
+
+    def lookup(self, identity: _Identity, algorithm: _Union[str, _Type[Hash]]) -> _Optional[bytes]:
+        """
+        Finds the cached digest of a file.
+
+        :param identity: The identity of the file(see `file_identity`).
+        :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        :return: The digest of the file content, or None if the file is not cached or has changed.
+        """
+        cls = get_algorithm(algorithm)
+        device, inode, size, mtime_ns = identity
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT size, mtime_ns, digest FROM digests WHERE device = ? AND inode = ? AND algorithm = ?',
+                (device, inode, cls.name)).fetchone()
+            if row is None or row[0] != size or row[1] != mtime_ns:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._used += 1
+            self._connection.execute('UPDATE digests SET used = ? WHERE device = ? AND inode = ? AND algorithm = ?',
+                                     (self._used, device, inode, cls.name))
+            self._changed()
+        return bytes(row[2])
+
+    def store(self, identity: _Identity, algorithm: _Union[str, _Type[Hash]], digest: bytes) -> None:
+        """
+        Caches the digest of a file, replacing the entry of an older version of the file.
+
+        :param identity: The identity of the file when it was hashed(see `file_identity`).
+        :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        :param digest: The digest of the whole file content.
+        """
+        name = get_algorithm(algorithm).name
+        digest = bytes(digest)
+        device, inode, size, mtime_ns = identity
+        with self._lock:
+            self._used += 1
+            cursor = self._connection.execute(
+                'INSERT OR IGNORE INTO digests VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (device, inode, name, size, mtime_ns, digest, self._used))
+            if cursor.rowcount:
+                self._count += 1
+            else:
+                self._connection.execute(
+                    'UPDATE digests SET size = ?, mtime_ns = ?, digest = ?, used = ? '
+                    'WHERE device = ? AND inode = ? AND algorithm = ?',
+                    (size, mtime_ns, digest, self._used, device, inode, name))
+            if self._count > self.max_entries:
+                self._connection.execute(
+                    'DELETE FROM digests WHERE rowid IN (SELECT rowid FROM digests ORDER BY used LIMIT ?)',
+                    (self._count - self.max_entries,))
+                self._count = self.max_entries
+            self._changed()
+
+    def hash_file(self, path: _Union[str, _os.PathLike], algorithm: _Union[str, _Type[Hash]] = 'sha256',
+                  use_mmap: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Hash:
+        """
+        Hashes a file, or returns its cached digest if the file has not changed since it was cached.
+
+        :param path: The path of the file.
+        :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        :param use_mmap: Maps the file into memory and hashes it in place instead of reading it in chunks.
+        :param chunk_size: The size of the reusable read buffer.
+        :return: The hash object of the file content, a read-only one holding only the digest if it came from the cache.
+        """
+        cls = get_algorithm(algorithm)
+        with open(path, 'rb') as file:
+            identity = file_identity(_os.fstat(file.fileno()))
+            digest = self.lookup(identity, cls)
+            if digest is not None:
+                hasher = _cached_class(cls)()
+                hasher._digest = digest
+                hasher._length = identity[2]
+                return hasher
+            hasher = cls()
+            if use_mmap:
+                hasher._update_mmap(file)
+            else:
+                hasher.update_file(file, chunk_size)
+            # A file modified while it was read is not cached
+            if file_identity(_os.fstat(file.fileno())) == identity:
+                self.store(identity, cls, hasher.digest())
+        return hasher
+
+    def flush(self) -> None:
+        """
+        Writes the pending changes to the database.
+        """
+        with self._lock:
+            self._connection.commit()
+            self._changes = 0
+
+    def clear(self) -> None:
+        """
+        Removes every cached digest and resets the statistics.
+        """
+        with self._lock:
+            self._connection.execute('DELETE FROM digests')
+            self._connection.commit()
+            self._count = 0
+            self._changes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def close(self) -> None:
+        """
+        Writes the pending changes and closes the database.
+        """
+        with self._lock:
+            self._connection.commit()
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __repr__(self):
+        return f"DigestCache(path={self.path!r}, max_entries={self.max_entries}, size={len(self)}, " \
+               f"hits={self.hits}, misses={self.misses})"
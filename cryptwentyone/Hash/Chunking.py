@@ -0,0 +1,134 @@
+# cryptwentyone.Hash.Chunking.py
+# CodeWriter21
+
+# Content-defined chunking(FastCDC-style gear hash):
+#
+#   * A 64-bit gear hash is rolled over the bytes of the chunk: h = ((h << 1) + GEAR[byte]) mod 2**64, so its top bit
+#     depends on the last 64 bytes only. GEAR[i] is the first 8 bytes(big-endian) of SHA256(b'cryptwentyone-gear' || i).
+#   * The first `min_size` bytes of a chunk are skipped. A chunk ends after the first byte where the masked top bits of
+#     the hash are all zero: a stricter mask before `avg_size` bytes and a looser one after it(normalized chunking), so
+#     most chunks are close to `avg_size`. A chunk ends at `max_size` bytes at the latest.
+#
+# The boundaries only depend on the content near them, so an edit in place only changes the chunks around it and the
+# rest of the chunks(and their digests) stay the same.
+
+import os as _os
+import functools as _functools
+
+from typing import Union as _Union, Type as _Type, Iterator as _Iterator, NamedTuple as _NamedTuple, \
+    BinaryIO as _BinaryIO, Tuple as _Tuple
+
+from .Hash import Hash, get_algorithm
+from .SHA2 import SHA256Python
+
+__all__ = ['Chunk', 'chunk_stream', 'chunk_file']
+
+MIN_SIZE = 2 << 10  # 2 KiB
+AVG_SIZE = 8 << 10  # 8 KiB
+MAX_SIZE = 64 << 10  # 64 KiB
+# The chunk sizes are at most this many bits before/after avg_size for the strict/loose mask.
+NORMALIZATION = 2
+
+_MASK64 = (1 << 64) - 1
+
+
+class Chunk(_NamedTuple):
+    offset: int
+    length: int
+    digest: bytes
+
+
+@_functools.lru_cache(maxsize=None)
+def _gear_table() -> _Tuple[int, ...]:
+    return tuple(int.from_bytes(SHA256Python(b'cryptwentyone-gear' + bytes([i])).digest()[:8], 'big')
+                 for i in range(256))
+
+
+def _top_mask(bits: int) -> int:
+    return ((1 << bits) - 1) << (64 - bits)
+
+
+def _cut(data: memoryview, min_size: int, avg_size: int, max_size: int, strict_mask: int, loose_mask: int) -> int:
+    """
+    Finds the end of the chunk starting at the beginning of the data.
+
+    :param data: The data, the chunk ends at its end if no boundary is found.
+    :return: The length of the chunk.
+    """
+    length = len(data)
+    if length <= min_size:
+        return length
+    end = min(length, max_size)
+    normal = min(avg_size, end)
+    gear = _gear_table()
+
+    h = 0
+    i = min_size
+    for byte in data[min_size:normal]:
+        h = ((h << 1) + gear[byte]) & _MASK64
+        i += 1
+        if not h & strict_mask:
+            return i
+    for byte in data[normal:end]:
+        h = ((h << 1) + gear[byte]) & _MASK64
+        i += 1
+        if not h & loose_mask:
+            return i
+    return end
+
+
+def chunk_stream(file: _BinaryIO, algorithm: _Union[str, _Type[Hash]] = 'sha256', min_size: int = MIN_SIZE,
+                 avg_size: int = AVG_SIZE, max_size: int = MAX_SIZE) -> _Iterator[Chunk]:
+    """
+    Splits a binary stream into content-defined chunks and hashes them. At most `max_size` bytes plus one read are kept
+    in memory.
+
+    :param file: The binary file object to read.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param min_size: The minimum size of a chunk, except for the last one.
+    :param avg_size: The target size of the chunks, a power of two.
+    :param max_size: The maximum size of a chunk.
+    :return: An iterator over the (offset, length, digest) of the chunks, in order.
+    """
+    if not 0 < min_size <= avg_size <= max_size:
+        raise ValueError("The sizes must satisfy 0 < min_size <= avg_size <= max_size")
+    if avg_size & (avg_size - 1):
+        raise ValueError("avg_size must be a power of two")
+    cls = get_algorithm(algorithm)
+    bits = avg_size.bit_length() - 1
+    strict_mask = _top_mask(bits + NORMALIZATION)
+    loose_mask = _top_mask(max(bits - NORMALIZATION, 1))
+
+    buffer = bytearray()
+    offset = 0
+    eof = False
+    while True:
+        while not eof and len(buffer) < max_size:
+            data = file.read(max_size)
+            if not data:
+                eof = True
+            buffer += data
+        if not buffer:
+            return
+        with memoryview(buffer) as view:
+            length = _cut(view, min_size, avg_size, max_size, strict_mask, loose_mask)
+            digest = cls(view[:length]).digest()
+        yield Chunk(offset, length, digest)
+        offset += length
+        del buffer[:length]
+
+
+def chunk_file(path: _Union[str, _os.PathLike], algorithm: _Union[str, _Type[Hash]] = 'sha256',
+               min_size: int = MIN_SIZE, avg_size: int = AVG_SIZE, max_size: int = MAX_SIZE) -> _Iterator[Chunk]:
+    """
+    Splits a file into content-defined chunks and hashes them, see `chunk_stream`.
+
+    :param path: The path of the file.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param min_size: The minimum size of a chunk, except for the last one.
+    :param avg_size: The target size of the chunks, a power of two.
+    :param max_size: The maximum size of a chunk.
+    :return: An iterator over the (offset, length, digest) of the chunks, in order.
+    """
+    with open(path, 'rb') as file:
+        yield from chunk_stream(file, algorithm, min_size, avg_size, max_size)
@@ -0,0 +1,58 @@
+# cryptwentyone.Hash.File.py
+# CodeWriter21
+
+import os as _os
+
+from typing import Union as _Union, Type as _Type, Optional as _Optional, Iterable as _Iterable, List as _List
+
+from .Hash import Hash, get_algorithm, DEFAULT_CHUNK_SIZE
+from .Cache import DigestCache
+from .Parallel import create_executor
+
+__all__ = ['hash_file', 'hash_files']
+
+
+def hash_file(path: _Union[str, _os.PathLike], algorithm: _Union[str, _Type[Hash]] = 'sha256',
+              use_mmap: bool = False, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              cache: _Optional[DigestCache] = None) -> Hash:
+    """
+    Hashes a file in constant memory.
+
+    :param path: The path of the file.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param use_mmap: Maps the file into memory and hashes it in place instead of reading it in chunks.
+    :param chunk_size: The size of the reusable read buffer.
+    :param cache: A digest cache, an unchanged file that is already in the cache is not read again.
+    :return: The hash object of the file content.
+    """
+    if cache is not None:
+        return cache.hash_file(path, algorithm, use_mmap=use_mmap, chunk_size=chunk_size)
+    return get_algorithm(algorithm).from_file(path, use_mmap=use_mmap, chunk_size=chunk_size)
+
+
+def _file_digest(path: _Union[str, _os.PathLike], cls: _Type[Hash], chunk_size: int) -> bytes:
+    return cls.from_file(path, chunk_size=chunk_size).digest()
+
+
+def hash_files(paths: _Iterable[_Union[str, _os.PathLike]], algorithm: _Union[str, _Type[Hash]] = 'sha256',
+               workers: _Optional[int] = None, executor: str = 'auto',
+               chunk_size: int = DEFAULT_CHUNK_SIZE) -> _List[bytes]:
+    """
+    Hashes many files on a pool of workers, each file in constant memory.
+
+    :param paths: The paths of the files.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param workers: The number of workers, the number of CPUs by default. 1 hashes the files in this thread.
+    :param executor: The kind of workers: 'thread', 'process' or 'auto'(threads on free-threaded Python builds,
+        processes when the GIL is enabled).
+    :param chunk_size: The size of the read buffer of every worker.
+    :return: The digests of the files in the same order. The first error(e.g. a missing file) is raised.
+    """
+    cls = get_algorithm(algorithm)
+    paths = list(paths)
+    if workers is None:
+        workers = _os.cpu_count() or 1
+    if min(workers, len(paths)) <= 1:
+        return [_file_digest(path, cls, chunk_size) for path in paths]
+    with create_executor(executor, min(workers, len(paths))) as pool:
+        return list(pool.map(_file_digest, paths, [cls] * len(paths), [chunk_size] * len(paths)))
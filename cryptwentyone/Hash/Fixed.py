@@ -0,0 +1,163 @@
+# cryptwentyone.Hash.Fixed.py
+# CodeWriter21
+
+# SHA256 of fixed-length messages: 32-byte keys and digests, 64-byte pairs of digests(Merkle tree nodes) and their
+# double-SHA256. The padding of these messages is known in advance, so the compressions are generated with it inlined
+# and the digests are passed between them as state words, without Hash objects, buffers or padding. The wide levels of
+# Merkle trees are hashed in parallel lanes of NumPy arrays when NumPy is installed.
+
+import struct as _struct
+import functools as _functools
+
+from typing import Union as _Union, Sequence as _Sequence, Tuple as _Tuple, Callable as _Callable, List as _List
+
+from .Kernels import fixed_kernel
+from .SHA2 import SHA256Python
+from .Batch import _sha256_numpy
+
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+__all__ = ['sha256_32', 'sha256_64', 'sha256d', 'merkle_root']
+
+# The levels of a Merkle tree with at least this many nodes are hashed on NumPy arrays.
+MIN_NUMPY_NODES = 32
+
+_Words = _Tuple[int, ...]
+_unpack8 = _struct.Struct('>8I').unpack
+_unpack16 = _struct.Struct('>16I').unpack
+_pack8 = _struct.Struct('>8I').pack
+
+
+@_functools.lru_cache(maxsize=None)
+def _kernels() -> _Tuple[_Callable[[_Words], _Words], _Callable[[_Words], _Words]]:
+    """
+    Generates the compressions of 32-byte and 64-byte messages, from their eight or sixteen big-endian words to the
+    eight state words of the digest.
+    """
+    rounds = SHA256Python._compress.rounds
+    iv = SHA256Python()._get_state()
+    padding_32 = list(_unpack8(SHA256Python._padding(32)))
+    padding_64 = list(_unpack16(SHA256Python._padding(64)))
+    return fixed_kernel(rounds, iv, [[None] * 8 + padding_32]), \
+        fixed_kernel(rounds, iv, [[None] * 16, padding_64])
+
+
+def _check_length(data: _Union[bytes, bytearray, memoryview], length: int) -> None:
+    if len(data) != length:
+        raise ValueError(f"The message must be {length} bytes long, got {len(data)}")
+
+
+def sha256_32(data: _Union[bytes, bytearray, memoryview]) -> bytes:
+    """
+    Returns the SHA256 digest of a 32-byte message, e.g. a key or a digest.
+
+    :param data: The 32-byte message.
+    :return: The digest.
+    """
+    _check_length(data, 32)
+    return _pack8(*_kernels()[0](_unpack8(data)))
+
+
+def sha256_64(data: _Union[bytes, bytearray, memoryview]) -> bytes:
+    """
+    Returns the SHA256 digest of a 64-byte message, e.g. two concatenated digests. The second block is the constant
+    padding block, its message schedule is computed in advance.
+
+    :param data: The 64-byte message.
+    :return: The digest.
+    """
+    _check_length(data, 64)
+    return _pack8(*_kernels()[1](_unpack16(data)))
+
+
+def sha256d(data: _Union[str, bytes, bytearray, memoryview]) -> bytes:
+    """
+    Returns the double SHA256 digest of a message: SHA256(SHA256(data)). The outer hash always uses the 32-byte fast
+    path and 32-byte and 64-byte messages use it for the inner hash too.
+
+    :param data: The message.
+    :return: The digest.
+    """
+    compress_32, compress_64 = _kernels()
+    if not isinstance(data, str) and len(data) == 32:
+        words = compress_32(_unpack8(data))
+    elif not isinstance(data, str) and len(data) == 64:
+        words = compress_64(_unpack16(data))
+    else:
+        words = _unpack8(SHA256Python(data).digest())
+    return _pack8(*compress_32(words))
+
+
+def _combine(level: _List[_Words], double: bool) -> _Words:
+    """
+    Combines the levels of a Merkle tree up to the root, one node at a time.
+
+    :param level: The state words of the digests of a level.
+    :param double: Whether the nodes are hashed with double SHA256.
+    :return: The state words of the root.
+    """
+    compress_32, compress_64 = _kernels()
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        if double:
+            level = [compress_32(compress_64(level[i] + level[i + 1])) for i in range(0, len(level), 2)]
+        else:
+            level = [compress_64(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+
+def _combine_numpy(columns: list, double: bool) -> list:
+    """
+    Combines a level of a Merkle tree into the next one, one lane per node.
+
+    :param columns: The eight arrays of the state words of the digests of the level.
+    :param double: Whether the nodes are hashed with double SHA256.
+    :return: The eight arrays of the next level.
+    """
+    if len(columns[0]) % 2:
+        columns = [_np.append(column, column[-1]) for column in columns]
+    lanes = len(columns[0]) // 2
+    iv = [_np.full(lanes, h, dtype=_np.uint32) for h in SHA256Python()._get_state()]
+    padding_64 = [_np.full(lanes, word, dtype=_np.uint32) for word in _unpack16(SHA256Python._padding(64))]
+    state = _sha256_numpy(iv, [column[0::2] for column in columns] + [column[1::2] for column in columns])
+    state = _sha256_numpy(state, padding_64)
+    if double:
+        padding_32 = [_np.full(lanes, word, dtype=_np.uint32) for word in _unpack8(SHA256Python._padding(32))]
+        state = _sha256_numpy(iv, state + padding_32)
+    return state
+
+
+def merkle_root(leaves: _Sequence[bytes], double: bool = True) -> bytes:
+    """
+    Computes the root of a binary Merkle tree of 32-byte digests in the Bitcoin layout:
+
+        node = SHA256d(left || right)(SHA256(left || right) if `double` is False)
+
+    Every level is built by combining the digests of the level below in pairs, from left to right. When a level has an
+    odd number of digests, the last one is paired with itself. A single leaf is the root.
+
+    The digests stay as state words from the leaves to the root, every node costs three compressions(two for the
+    64-byte message, one for the outer hash) with the constant padding blocks precomputed. The levels with at least
+    `MIN_NUMPY_NODES` nodes are hashed in parallel lanes when NumPy is installed.
+
+    :param leaves: The 32-byte leaf digests in order(e.g. transaction ids in the internal byte order).
+    :param double: Whether the nodes are hashed with double SHA256.
+    :return: The 32-byte root.
+    """
+    if not leaves:
+        raise ValueError("A tree needs at least one leaf")
+    for leaf in leaves:
+        _check_length(leaf, 32)
+    if _np is not None and len(leaves) >= 2 * MIN_NUMPY_NODES:
+        level = _np.frombuffer(b''.join(leaves), dtype='>u4').reshape(len(leaves), 8).astype(_np.uint32)
+        columns = list(level.T)
+        while len(columns[0]) >= 2 * MIN_NUMPY_NODES:
+            columns = _combine_numpy(columns, double)
+        words = list(zip(*(column.tolist() for column in columns)))
+    else:
+        words = [_unpack8(leaf) for leaf in leaves]
+    return _pack8(*_combine(words, double))
@@ -0,0 +1,111 @@
+# cryptwentyone.Hash.HMAC.py
+# CodeWriter21
+
+import hmac as _hmac
+import binascii as _binascii
+
+from typing import Union as _Union, Type as _Type
+
+from .Hash import Hash, get_algorithm
+
+__all__ = ['HMAC']
+
+_TRANSLATE_IPAD = bytes(x ^ 0x36 for x in range(256))
+_TRANSLATE_OPAD = bytes(x ^ 0x5c for x in range(256))
+
+
+class HMAC:
+    """
+    Keyed-hash message authentication code(RFC 2104) over any of the package's hash algorithms.
+
+    The states after the inner and the outer padded keys are computed once per key and copied for every message, so a
+    message costs only its own blocks plus one outer block.
+    """
+
+    def __init__(self, key: _Union[str, bytes], message: _Union[str, bytes] = b'',
+                 digestmod: _Union[str, _Type[Hash]] = 'sha256'):
+        """
+        :param key: The secret key.
+        :param message: The initial message.
+        :param digestmod: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        """
+        self.digestmod: _Type[Hash] = get_algorithm(digestmod)
+        self.name: str = f'hmac-{self.digestmod.name}'
+        self.block_size: int = self.digestmod.block_size
+        self.digest_size: int = self.digestmod.digest_size
+
+        key = Hash._as_view(key).tobytes()
+        if len(key) > self.block_size:
+            key = self.digestmod(key).digest()
+        key = key.ljust(self.block_size, b'\x00')
+
+        # The padded keys fill exactly one block, so these only hold the compressed state.
+        self._inner_pad: Hash = self.digestmod(key.translate(_TRANSLATE_IPAD))
+        self._outer_pad: Hash = self.digestmod(key.translate(_TRANSLATE_OPAD))
+
+        self._inner: Hash = self._inner_pad.copy()
+        self.update(message)
+
+    def update(self, message: _Union[str, bytes]) -> None:
+        """
+        Feeds more data to the HMAC object.
+
+        :param message: The data to add to the message.
+        """
+        self._inner.update(message)
+
+    def copy(self) -> 'HMAC':
+        """
+        Returns a copy of the HMAC object. Feeding data to the copy does not affect the original object.
+
+        :return: A copy of the HMAC object.
+        """
+        other = self.__class__.__new__(self.__class__)
+        other.__dict__.update(self.__dict__)
+        other._inner = self._inner.copy()
+        return other
+
+    def _finalize(self, inner: Hash) -> bytes:
+        outer = self._outer_pad.copy()
+        outer.update(inner.digest())
+        return outer.digest()
+
+    def digest(self) -> bytes:
+        """
+        Returns the HMAC of the data fed to the object so far.
+
+        :return: The HMAC of the message.
+        """
+        return self._finalize(self._inner)
+
+    def hexdigest(self) -> str:
+        """
+        Returns the HMAC of the message as a hexadecimal string.
+
+        :return: The HMAC of the message as a hexadecimal string.
+        """
+        return _binascii.hexlify(self.digest()).decode()
+
+    def sign(self, message: _Union[str, bytes]) -> bytes:
+        """
+        Returns the HMAC of a message under the same key, without changing this object.
+
+        :param message: The message to sign.
+        :return: The HMAC of the message.
+        """
+        inner = self._inner_pad.copy()
+        inner.update(message)
+        return self._finalize(inner)
+
+    def verify(self, message: _Union[str, bytes], mac: bytes) -> bool:
+        """
+        Checks the HMAC of a message in constant time.
+
+        :param message: The signed message.
+        :param mac: The HMAC to check.
+        :return: True if the HMAC is valid.
+        """
+        return _hmac.compare_digest(self.sign(message), mac)
+
+    def __repr__(self):
+        return f"HMAC(name={self.name!r}, hmac={self.hexdigest()!r})"
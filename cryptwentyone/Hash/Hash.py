@@ -1,34 +1,300 @@
 # cryptwentyone.Hash.SHA2.py
 # CodeWriter21
 
+import os as _os
+import mmap as _mmap
+import zlib as _zlib
+import struct as _struct
 import binascii as _binascii
 
-from typing import Union as _Union
+from typing import Union as _Union, Dict as _Dict, Type as _Type, Tuple as _Tuple, Optional as _Optional, \
+    BinaryIO as _BinaryIO
 
-__all__ = ['Hash']
+from .Kernels import Kernel as _Kernel
+from .Instrumentation import Instrumentation as _Instrumentation
+
+__all__ = ['Hash', 'get_algorithm']
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+# Strings are encoded with UTF-8, everything else must support the buffer protocol.
+_Message = _Union[str, bytes, bytearray, memoryview]
+
+# The exported state: magic, version, algorithm name, message length, state words, partial block and a CRC-32 of
+# everything before it.
+_STATE_MAGIC = b'C21H'
+_STATE_VERSION = 1
+_STATE_HEADER = _struct.Struct('>4sBB')
+
+# Maps the name of every built-in algorithm to its hash class(see `_register`).
+_algorithms: _Dict[str, _Type['Hash']] = {}
+
+
+def _register(cls: _Type['Hash']) -> _Type['Hash']:
+    """
+    Registers a built-in hash class under its name. Subclasses are not registered, so they never replace the built-in
+    algorithms looked up by name; pass the class itself to use one.
+
+    :param cls: The hash class.
+    :return: The hash class, so it can be used as a decorator.
+    """
+    if cls.name in _algorithms:
+        raise ValueError(f"The {cls.name!r} algorithm is already registered")
+    _algorithms[cls.name] = cls
+    return cls
+
+
+def get_algorithm(algorithm: _Union[str, _Type['Hash']]) -> _Type['Hash']:
+    """
+    Finds the hash class of an algorithm.
+
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :return: The hash class.
+    """
+    if isinstance(algorithm, type) and issubclass(algorithm, Hash):
+        return algorithm
+    try:
+        return _algorithms[str(algorithm).lower()]
+    except KeyError:
+        raise ValueError(f"Unsupported hash algorithm: {algorithm!r}") from None
 
 
 class Hash:
+    __slots__ = ('reference', '_message', '_digest', '_buffer', '_length')
+
     X = 0x100000000  # 2**32
     name: str = 'hash'
     default_n_bits: int = 32
+    block_size: int = 64
+    digest_size: int = 0
+    # Size and byte order of the message length appended to the padding.
+    length_size: int = 8
+    length_byteorder: str = 'big'
+    # Names of the attributes holding the state words.
+    _state_names: _Tuple[str, ...] = ()
+    # The generated compression function of the algorithm(see Kernels.py), used unless the object is in reference mode.
+    _compress: _Optional[_Kernel] = None
+    # Collects statistics when set(see Instrumentation.py), for every algorithm when set on Hash or for one algorithm
+    # when set on its class.
+    instrumentation: _Optional[_Instrumentation] = None
+    # The names of every slot of the class, copied by `copy`.
+    _copied_slots: _Tuple[str, ...] = ()
 
-    def __init__(self, message: _Union[str, bytes]):
-        if isinstance(message, str):
-            message = message.encode()
-        if not isinstance(message, bytes):
-            raise TypeError("Message must be a string or bytes")
-        self.message: bytes = message
+    def __init__(self, message: _Message = b'', *, reference: bool = False, keep_message: bool = False):
+        message = self._check_message(message)
+        # Reference mode uses the readable `_process_chunk` implementation instead of the generated kernel.
+        self.reference: bool = reference
+        # The message is only kept when asked to, for debugging.
+        self._message: _Optional[bytes] = None
+        if keep_message:
+            self._message = message if isinstance(message, bytes) else self._as_view(message).tobytes()
+        self._digest: _Optional[bytes] = None
 
         self._initialize_variables()
 
-        self.ml = (len(self.message) * 8) % Hash.X
+        # The bytes of the last incomplete block and the number of bytes processed so far.
+        self._buffer: bytes = b''
+        self._length: int = 0
+
+        if self.instrumentation is not None:
+            self.instrumentation.record_start(self)
+
+        # The message is hashed right away and no reference to it is kept, so the reading methods(digest, copy, ...)
+        # never change the object and a hash object can be shared between threads once it is built.
+        self._update(message)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._copied_slots = tuple(name for klass in reversed(cls.__mro__)
+                                  for name in klass.__dict__.get('__slots__', ()))
+
+    @classmethod
+    def from_file(cls, path: _Union[str, _os.PathLike], use_mmap: bool = False,
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'Hash':
+        """
+        Hashes a file without loading the whole file into memory.
+
+        :param path: The path of the file.
+        :param use_mmap: Maps the file into memory and hashes it in place instead of reading it in chunks.
+        :param chunk_size: The size of the reusable read buffer.
+        :return: The hash object of the file content.
+        """
+        self = cls()
+        with open(path, 'rb') as file:
+            if use_mmap:
+                self._update_mmap(file)
+            else:
+                self.update_file(file, chunk_size)
+        return self
 
-        self.hash: bytes = self._hash()
+    def update_file(self, file: _BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Feeds the rest of an open binary file to the hash object. The file is read into a single reusable buffer and
+        the complete blocks are processed straight from it.
+
+        :param file: The file object to read.
+        :param chunk_size: The size of the reusable read buffer.
+        """
+        self._digest = None
+        readinto = getattr(file, 'readinto', None)
+        if readinto is None:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                self.update(chunk)
+            return
+
+        block_size = self.block_size
+        buffer = bytearray(max(chunk_size - chunk_size % block_size, block_size))
+        view = memoryview(buffer)
+        while True:
+            n = readinto(buffer)
+            if not n:
+                break
+            if n % block_size or self._buffer or self._message is not None:
+                # A short read(keep the carry in the regular buffer) or a kept message(append the data to it)
+                self.update(view[:n])
+                continue
+            self._length += n
+            if self.instrumentation is not None:
+                self.instrumentation.record_bytes(self, n)
+            self._process_blocks(view[:n])
+
+    def _update_mmap(self, file: _BinaryIO) -> None:
+        """
+        Feeds an open binary file to the hash object using a memory map.
+
+        :param file: The file object to map.
+        """
+        self._digest = None
+        size = _os.fstat(file.fileno()).st_size
+        if size == 0 or self._buffer or self._message is not None:
+            self.update_file(file)
+            return
+
+        block_size = self.block_size
+        end = size - size % block_size
+        with _mmap.mmap(file.fileno(), 0, access=_mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                self._process_blocks(view[:end])
+                self._length += end
+                if self.instrumentation is not None:
+                    self.instrumentation.record_bytes(self, end)
+                self.update(view[end:])
+            finally:
+                view.release()
+
+    @staticmethod
+    def _check_message(message: _Message) -> _Message:
+        if isinstance(message, str):
+            message = message.encode()
+        try:
+            memoryview(message)
+        except TypeError:
+            raise TypeError("Message must be a string or a bytes-like object") from None
+        return message
+
+    @staticmethod
+    def _as_view(message: _Message) -> memoryview:
+        """
+        Returns a flat byte view of a bytes-like object without copying it when possible.
+
+        :param message: A string or any object supporting the buffer protocol.
+        :return: A one-dimensional memoryview of unsigned bytes.
+        """
+        view = memoryview(Hash._check_message(message))
+        if not view.c_contiguous:
+            view = memoryview(view.tobytes())
+        return view.cast('B')
 
     def _initialize_variables(self):
         pass
 
+    def _get_state(self) -> _Tuple[int, ...]:
+        """
+        Returns the current state words(e.g. h0..h7).
+        """
+        return tuple(getattr(self, name) for name in self._state_names)
+
+    def _set_state(self, state: _Tuple[int, ...]) -> None:
+        """
+        Replaces the current state words(e.g. h0..h7).
+        """
+        for name, value in zip(self._state_names, state):
+            setattr(self, name, value)
+
+    def export_state(self) -> bytes:
+        """
+        Exports the internal state of the hash object as a compact byte string, to checkpoint a long-running hash and
+        continue it later with `from_state`.
+
+        The string holds the state words, the number of bytes processed so far and the last incomplete block(less than
+        one block), so it may reveal the tail of the message.
+
+        :return: The versioned state.
+        """
+        words = self._get_state()
+        name = self.name.encode('ascii')
+        word_size = self.block_size // 16
+        state = _STATE_HEADER.pack(_STATE_MAGIC, _STATE_VERSION, len(name)) + name + \
+            self._length.to_bytes(16, 'big') + b''.join(word.to_bytes(word_size, 'big') for word in words) + \
+            bytes([len(self._buffer)]) + self._buffer
+        return state + _struct.pack('>I', _zlib.crc32(state))
+
+    @classmethod
+    def from_state(cls, state: bytes, *, reference: bool = False) -> 'Hash':
+        """
+        Rebuilds a hash object from a state exported by `export_state`. The object continues from where the exported
+        one was, so only the rest of the message has to be fed to it.
+
+        `Hash.from_state(state)` creates an object of the built-in algorithm named in the state, a subclass creates an
+        object of its own class and only accepts the states of its algorithm.
+
+        :param state: The exported state.
+        :param reference: Uses the readable implementation instead of the generated kernel.
+        :return: The hash object.
+        """
+        state = bytes(state)
+        if len(state) < _STATE_HEADER.size + 4 or _zlib.crc32(state[:-4]) != int.from_bytes(state[-4:], 'big'):
+            raise ValueError("Invalid or corrupted hash state")
+        magic, version, name_length = _STATE_HEADER.unpack_from(state)
+        if magic != _STATE_MAGIC:
+            raise ValueError("Invalid or corrupted hash state")
+        if version != _STATE_VERSION:
+            raise ValueError(f"Unsupported hash state version: {version}")
+
+        position = _STATE_HEADER.size
+        name = state[position:position + name_length].decode('ascii', 'replace')
+        if cls is Hash:
+            klass = get_algorithm(name)
+        elif name == cls.name:
+            klass = cls
+        else:
+            raise ValueError(f"The state belongs to the {name} algorithm, not {cls.name}")
+        position += name_length
+
+        word_size = klass.block_size // 16
+        words_end = position + 16 + word_size * len(klass._state_names)
+        if words_end >= len(state) - 4:
+            raise ValueError("Invalid or corrupted hash state")
+        length = int.from_bytes(state[position:position + 16], 'big')
+        words = tuple(int.from_bytes(state[i:i + word_size], 'big') for i in range(position + 16, words_end, word_size))
+        buffer = state[words_end + 1:-4]
+        if len(buffer) != state[words_end] or len(buffer) != length % klass.block_size:
+            raise ValueError("Invalid or corrupted hash state")
+
+        self = klass(reference=reference)
+        self._set_state(words)
+        self._length = length
+        self._buffer = buffer
+        return self
+
+    @property
+    def ml(self) -> int:
+        """
+        The length of the processed message in bits, modulo the size of the length field.
+        """
+        return (self._length * 8) % (1 << (self.length_size * 8))
+
     def left_rotate(self, x: int, n: int, bits: int = 0) -> int:
         """
         Rotates x to the left by n bits.
@@ -61,6 +327,76 @@ class Hash:
         """
         return sum(args) % self.X
 
+    @property
+    def message(self) -> _Optional[bytes]:
+        """
+        The message given to the constructor and to `update`, if the object was created with `keep_message=True`.
+        """
+        return self._message
+
+    def update(self, message: _Message) -> None:
+        """
+        Feeds more data to the hash object. Every complete block is processed right away, straight from the given
+        buffer, and only the last incomplete block is kept in memory.
+
+        :param message: The data to add to the message(a string or any bytes-like object).
+        """
+        self._digest = None
+        if self._message is not None:
+            self._message += self._as_view(message)
+        self._update(message)
+
+    def _update(self, message: _Message) -> None:
+        view = self._as_view(message)
+        length = len(view)
+        self._length += length
+        if self.instrumentation is not None:
+            self.instrumentation.record_bytes(self, length)
+        block_size = self.block_size
+
+        start = 0
+        if self._buffer:
+            # Complete the block left from the previous update
+            start = block_size - len(self._buffer)
+            if length < start:
+                self._buffer += view
+                return
+            self._process_blocks(self._buffer + view[:start])
+
+        end = length - (length - start) % block_size
+        self._process_blocks(view[start:end])
+        self._buffer = view[end:].tobytes()
+
+    @classmethod
+    def _padding(cls, length: int) -> bytes:
+        """
+        Returns the padding that follows a message of the given length.
+
+        :param length: The length of the message in bytes.
+        :return: The padding bytes.
+        """
+        # Pad the message with a 1 bit followed by 0 bits until its length is congruent to -length_size modulo
+        # block_size.
+        zeros = (cls.block_size - cls.length_size - 1 - length) % cls.block_size
+        padding = b"\x80" + b"\x00" * zeros  # 0b10000000
+
+        # Append the representation of the original message's length
+        ml = (length * 8) % (1 << (cls.length_size * 8))
+        return padding + ml.to_bytes(cls.length_size, cls.length_byteorder)
+
+    def _preprocess(self) -> bytes:
+        """
+        Pads the last incomplete block and adds the representation of length to it.
+
+        :return: The padded last block(or two blocks if the length does not fit in one).
+        """
+        if self.instrumentation is None:
+            return self._buffer + self._padding(self._length)
+        start = self.instrumentation.timer()
+        message = self._buffer + self._padding(self._length)
+        self.instrumentation.record_padding(self, self.instrumentation.timer() - start)
+        return message
+
     def _hash(self) -> bytes:
         """
         Calculates the hash of the message.
@@ -71,6 +407,26 @@ class Hash:
         # This method will be implemented by the child class.
         raise NotImplementedError('Child class must implement _hash method!')
 
+    def _process_blocks(self, data: _Union[bytes, memoryview]) -> None:
+        """
+        Processes consecutive blocks of the message.
+
+        :param data: The blocks, its length must be a multiple of the block size.
+        """
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            start = instrumentation.timer()
+
+        if self.reference or self._compress is None:
+            block_size = self.block_size
+            for i in range(0, len(data), block_size):
+                self._process_chunk(data[i:i + block_size])
+        elif data:
+            self._set_state(self._compress(self._get_state(), data))
+
+        if instrumentation is not None and data:
+            instrumentation.record_blocks(self, len(data) // self.block_size, instrumentation.timer() - start)
+
     def _process_chunk(self, chunk: bytes):
         """
         Processes a chunk of the message.
@@ -81,6 +437,36 @@ class Hash:
         # This method will be implemented by the child class.
         raise NotImplementedError('Child class must implement _hash method!')
 
+    def copy(self) -> 'Hash':
+        """
+        Returns a copy of the hash object. Feeding data to the copy does not affect the original object.
+
+        :return: A copy of the hash object.
+        """
+        other = object.__new__(self.__class__)
+        for name in self._copied_slots:
+            setattr(other, name, getattr(self, name))
+        if hasattr(self, '__dict__'):
+            other.__dict__.update(self.__dict__)
+        return other
+
+    def digest(self) -> bytes:
+        """
+        Returns the hash of the data fed to the object so far. The object can still be updated afterwards.
+
+        :return: The hash of the message.
+        """
+        # Computed on first use and kept until the next update
+        if self._digest is None:
+            self._digest = self.copy()._hash()
+            if self.instrumentation is not None:
+                self.instrumentation.record_finish(self, self._digest)
+        return self._digest
+
+    @property
+    def hash(self) -> bytes:
+        return self.digest()
+
     def hexdigest(self) -> str:
         """
         Returns the hash of the message as a hexadecimal string.
@@ -93,7 +479,9 @@ class Hash:
         return _binascii.hexlify(self.hash).decode()
 
     def __repr__(self):
-        return f"Hash(message={self.message!r}, hash={str(self)!r})"
+        if self._message is not None:
+            return f"{self.__class__.__name__}(message={self._message!r}, hash={str(self)!r})"
+        return f"{self.__class__.__name__}(hash={str(self)!r})"
 
     def __eq__(self, other):
         return self.hash == other.hash
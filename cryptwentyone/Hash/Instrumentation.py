@@ -0,0 +1,89 @@
+# cryptwentyone.Hash.Instrumentation.py
+# CodeWriter21
+
+import time as _time
+import threading as _threading
+
+from typing import Callable as _Callable, Optional as _Optional, Dict as _Dict, Any as _Any
+
+__all__ = ['Instrumentation']
+
+_COUNTERS = ('objects', 'bytes', 'blocks', 'digests', 'compress_seconds', 'padding_seconds')
+
+
+class Instrumentation:
+    """
+    Collects per-algorithm statistics of the hash objects: objects created, bytes fed, blocks compressed, digests
+    computed and the time spent in compression and in padding.
+
+    It is disabled by default and costs a single attribute check per call when disabled. Enable it for every algorithm
+    with `Hash.instrumentation = Instrumentation()`, or for one class only, e.g.
+    `SHA256Python.instrumentation = Instrumentation()`.
+
+    Hash objects sharing an instrumentation object may be used from several threads.
+    """
+
+    def __init__(self, timer: _Callable[[], float] = _time.perf_counter,
+                 on_start: _Optional[_Callable[[_Any], None]] = None,
+                 on_block: _Optional[_Callable[[_Any, int, float], None]] = None,
+                 on_finish: _Optional[_Callable[[_Any, bytes], None]] = None):
+        """
+        :param timer: Returns the current time in seconds.
+        :param on_start: Called with every new hash object.
+        :param on_block: Called with the hash object, the number of blocks and the seconds it took, after every run of
+            compressed blocks.
+        :param on_finish: Called with the hash object and the digest, after every digest.
+        """
+        self.timer: _Callable[[], float] = timer
+        self.on_start = on_start
+        self.on_block = on_block
+        self.on_finish = on_finish
+        self._stats: _Dict[str, _Dict[str, float]] = {}
+        self._lock = _threading.Lock()
+
+    def _add(self, name: str, **values) -> None:
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = dict.fromkeys(_COUNTERS, 0)
+            for key, value in values.items():
+                stats[key] += value
+
+    def record_start(self, hasher) -> None:
+        self._add(hasher.name, objects=1)
+        if self.on_start is not None:
+            self.on_start(hasher)
+
+    def record_bytes(self, hasher, length: int) -> None:
+        self._add(hasher.name, bytes=length)
+
+    def record_blocks(self, hasher, count: int, seconds: float) -> None:
+        self._add(hasher.name, blocks=count, compress_seconds=seconds)
+        if self.on_block is not None:
+            self.on_block(hasher, count, seconds)
+
+    def record_padding(self, hasher, seconds: float) -> None:
+        self._add(hasher.name, padding_seconds=seconds)
+
+    def record_finish(self, hasher, digest: bytes) -> None:
+        self._add(hasher.name, digests=1)
+        if self.on_finish is not None:
+            self.on_finish(hasher, digest)
+
+    def as_dict(self) -> _Dict[str, _Dict[str, float]]:
+        """
+        Returns the statistics as a plain dictionary: {algorithm name: {counter: value}}, with the counters 'objects',
+        'bytes', 'blocks', 'digests', 'compress_seconds' and 'padding_seconds'.
+        """
+        with self._lock:
+            return {name: dict(stats) for name, stats in self._stats.items()}
+
+    def reset(self) -> None:
+        """
+        Resets every counter.
+        """
+        with self._lock:
+            self._stats.clear()
+
+    def __repr__(self):
+        return f"Instrumentation({self.as_dict()!r})"
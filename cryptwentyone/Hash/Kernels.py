@@ -0,0 +1,417 @@
+# cryptwentyone.Hash.Kernels.py
+# CodeWriter21
+
+# The kernels are straight-line versions of the `_process_chunk` methods: every round is written out with its
+# constants inlined, the working variables are renamed instead of being shifted each round and everything is kept in
+# local variables. They are generated as source code and compiled once, when the hash classes are defined.
+
+import re as _re
+import struct as _struct
+
+from typing import Callable as _Callable, Sequence as _Sequence, Tuple as _Tuple, Union as _Union, List as _List, \
+    NamedTuple as _NamedTuple, Dict as _Dict, Optional as _Optional
+
+__all__ = ['md5_kernel', 'sha1_kernel', 'sha2_kernel', 'pbkdf2_kernel', 'nonce_kernel', 'fixed_kernel', 'Kernel',
+           'Rounds']
+
+_NAME = _re.compile(r'\b[a-z]\w*\b')
+
+# compress(state, data) processes every block of data(its length must be a multiple of the block size) and returns the
+# new state.
+Kernel = _Callable[[_Tuple[int, ...], _Union[bytes, memoryview]], _Tuple[int, ...]]
+
+
+class Rounds(_NamedTuple):
+    """
+    The generated source code of one compression: it reads the message words w0..w15 and the working variables
+    `working`, and leaves its result in the working variables named by `final`.
+    """
+    name: str
+    body: _List[str]
+    working: _List[str]
+    final: _List[str]
+    mask: str
+    word_format: str
+    block_size: int
+
+
+def _compile(rounds: Rounds, source: str, function: str, namespace: dict) -> _Callable:
+    """
+    Compiles the source code of a generated function.
+
+    :param rounds: The compression the function is made of.
+    :param source: The source code.
+    :param function: The name of the function defined by the source code.
+    :param namespace: The globals of the function.
+    :return: The function.
+    """
+    exec(compile(source, f'<{rounds.name} {function}>', 'exec'), namespace)
+    result = namespace[function]
+    result.source = source
+    result.rounds = rounds
+    return result
+
+
+def _compress_kernel(rounds: Rounds) -> Kernel:
+    """
+    Builds the compress function of a compression.
+
+    :param rounds: The compression.
+    :return: The compress function.
+    """
+    state = [f'h{i}' for i in range(len(rounds.working))]
+    state_names = ', '.join(state)
+    lines = [
+        'def compress(state, data, _unpack_from=_unpack_from):',
+        f'    {state_names} = state',
+        f'    for offset in range(0, len(data), {rounds.block_size}):',
+        f'        {", ".join(f"w{i}" for i in range(16))} = _unpack_from(data, offset)',
+        f'        {", ".join(rounds.working)} = {state_names}',
+    ]
+    lines += ['        ' + line for line in rounds.body]
+    lines += [f'        {h} = ({h} + {v}) & {rounds.mask}' for h, v in zip(state, rounds.final)]
+    lines.append(f'    return {state_names}')
+    namespace = {'_unpack_from': _struct.Struct(rounds.word_format).unpack_from}
+    return _compile(rounds, '\n'.join(lines) + '\n', 'compress', namespace)
+
+
+def _md5_rounds(k: _Sequence[int], s: _Sequence[int]) -> Rounds:
+    mask = '0xffffffff'
+    v = ['a', 'b', 'c', 'd']
+    body = []
+    for i in range(64):
+        a, b, c, d = v
+        if i <= 15:
+            f = f'{d} ^ ({b} & ({c} ^ {d}))'
+            g = i
+        elif i <= 31:
+            f = f'{c} ^ ({d} & ({b} ^ {c}))'
+            g = (5 * i + 1) % 16
+        elif i <= 47:
+            f = f'{b} ^ {c} ^ {d}'
+            g = (3 * i + 5) % 16
+        else:
+            f = f'{c} ^ ({b} | ~{d})'
+            g = (7 * i) % 16
+        body.append(f'{a} = ({a} + ({f}) + {k[i]:#x} + w{g}) & {mask}')
+        body.append(f'{a} = ((({a} << {s[i]}) | ({a} >> {32 - s[i]})) + {b}) & {mask}')
+        v = [d, a, b, c]
+    return Rounds('md5', body, ['a', 'b', 'c', 'd'], v, mask, '<16I', 64)
+
+
+def _sha1_rounds(k: _Sequence[int]) -> Rounds:
+    mask = '0xffffffff'
+    body = []
+    # Message schedule
+    for i in range(16, 80):
+        body.append(f'w{i} = w{i - 3} ^ w{i - 8} ^ w{i - 14} ^ w{i - 16}')
+        body.append(f'w{i} = ((w{i} << 1) | (w{i} >> 31)) & {mask}')
+    v = ['a', 'b', 'c', 'd', 'e']
+    for i in range(80):
+        a, b, c, d, e = v
+        if i <= 19:
+            f = f'{d} ^ ({b} & ({c} ^ {d}))'
+        elif i <= 39 or i >= 60:
+            f = f'{b} ^ {c} ^ {d}'
+        else:
+            f = f'({b} & {c}) | ({d} & ({b} | {c}))'
+        body.append(f'{e} = ({e} + (({a} << 5) | ({a} >> 27)) + ({f}) + {k[i // 20]:#x} + w{i}) & {mask}')
+        body.append(f'{b} = (({b} << 30) | ({b} >> 2)) & {mask}')
+        v = [e, a, b, c, d]
+    return Rounds('sha1', body, ['a', 'b', 'c', 'd', 'e'], v, mask, '>16I', 64)
+
+
+def _sha2_rounds(k: _Sequence[int], bits: int, big_sigma0: _Tuple[int, int, int], big_sigma1: _Tuple[int, int, int],
+                 small_sigma0: _Tuple[int, int, int], small_sigma1: _Tuple[int, int, int]) -> Rounds:
+    mask = hex((1 << bits) - 1)
+
+    def rotr(x: str, n: int) -> str:
+        # The bits above the word are garbage, they are removed by the mask of the sum
+        return f'({x} >> {n} | {x} << {bits - n})'
+
+    def sigma(x: str, rotations: _Tuple[int, int, int], shift: bool) -> str:
+        last = f'{x} >> {rotations[2]}' if shift else rotr(x, rotations[2])
+        return f'({rotr(x, rotations[0])} ^ {rotr(x, rotations[1])} ^ {last})'
+
+    body = []
+    # Message schedule
+    for i in range(16, len(k)):
+        s0 = sigma(f'w{i - 15}', small_sigma0, True)
+        s1 = sigma(f'w{i - 2}', small_sigma1, True)
+        body.append(f'w{i} = (w{i - 16} + {s0} + w{i - 7} + {s1}) & {mask}')
+    v = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
+    for i in range(len(k)):
+        a, b, c, d, e, f, g, h = v
+        s1 = sigma(e, big_sigma1, False)
+        s0 = sigma(a, big_sigma0, False)
+        # The constant and the message word are added first, so they are folded together when the word is known
+        body.append(f'{h} = {h} + {s1} + ({g} ^ ({e} & ({f} ^ {g}))) + ({k[i]:#x} + w{i})')
+        body.append(f'{d} = ({d} + {h}) & {mask}')
+        body.append(f'{h} = ({h} + {s0} + (({a} & {b}) | ({c} & ({a} | {b})))) & {mask}')
+        v = [h, a, b, c, d, e, f, g]
+    return Rounds(f'sha{bits * 8}', body, ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h'], v, mask,
+                  '>16I' if bits == 32 else '>16Q', bits * 2)
+
+
+def md5_kernel(k: _Sequence[int], s: _Sequence[int]) -> Kernel:
+    """
+    Generates the MD5 compress function.
+
+    :param k: The 64 round constants.
+    :param s: The 64 shift amounts.
+    :return: The compress function.
+    """
+    return _compress_kernel(_md5_rounds(k, s))
+
+
+def sha1_kernel(k: _Sequence[int]) -> Kernel:
+    """
+    Generates the SHA1 compress function.
+
+    :param k: The 4 round constants.
+    :return: The compress function.
+    """
+    return _compress_kernel(_sha1_rounds(k))
+
+
+def sha2_kernel(k: _Sequence[int], bits: int, big_sigma0: _Tuple[int, int, int], big_sigma1: _Tuple[int, int, int],
+                small_sigma0: _Tuple[int, int, int], small_sigma1: _Tuple[int, int, int]) -> Kernel:
+    """
+    Generates the compress function of a SHA2 family.
+
+    :param k: The round constants, one per round.
+    :param bits: The size of a word(32 or 64).
+    :param big_sigma0: The three rotations of Σ0.
+    :param big_sigma1: The three rotations of Σ1.
+    :param small_sigma0: The two rotations and the shift of σ0.
+    :param small_sigma1: The two rotations and the shift of σ1.
+    :return: The compress function.
+    """
+    return _compress_kernel(_sha2_rounds(k, bits, big_sigma0, big_sigma1, small_sigma0, small_sigma1))
+
+
+def pbkdf2_kernel(rounds: Rounds, block: _Sequence[int], digest_size: int) -> _Callable:
+    """
+    Generates the iteration loop of PBKDF2-HMAC:
+
+        loop(inner, outer, u, iterations) -> U1 ^ U2 ^ ... ^ U(iterations + 1)
+
+    where `inner` and `outer` are the states after the padded keys and `u` holds the digest words of U1.
+
+    Every iteration is two compressions of a single block(the inner and the outer hash of U) working on the state
+    integers only: the digest words of one compression are fed as the message words of the next one. When the digest
+    ends in the middle of a word(e.g. SHA512/224), the digest bits of that word are kept in its upper part and the
+    padding fills the rest.
+
+    :param rounds: The compression of the hash algorithm.
+    :param block: The sixteen words of a padded block holding a digest, with zeros in place of the digest bits.
+    :param digest_size: The size of a digest in bytes.
+    :return: The loop function.
+    """
+    mask = rounds.mask
+    size = len(rounds.working)
+    word_size = _struct.calcsize(rounds.word_format[-1])
+    digest_words = -(-digest_size // word_size)
+    # The mask of the digest bits of every word, only the last one may be partial
+    masks = [mask] * digest_words
+    if digest_size % word_size:
+        masks[-1] = hex(int(mask, 16) ^ ((1 << (8 * (digest_words * word_size - digest_size))) - 1))
+
+    def message_word(i: int, value: str) -> str:
+        # A digest word of U as a message word of the next compression
+        if masks[i] == mask:
+            return value
+        return f'({value}) & {masks[i]} | {block[i]:#x}'
+
+    u = [f'u{i}' for i in range(digest_words)]
+    x = [f'x{i}' for i in range(digest_words)]
+    inner = ', '.join(f'i{i}' for i in range(size))
+    outer = ', '.join(f'o{i}' for i in range(size))
+    padding = [f'w{i} = {block[i]:#x}' for i in range(digest_words, 16)]
+    lines = [
+        'def loop(inner, outer, u, iterations):',
+        f'    {inner} = inner',
+        f'    {outer} = outer',
+        f'    {", ".join(u)}, = u',
+        f'    {", ".join(x)}, = u',
+        '    for _ in range(iterations):',
+        # The inner hash of U
+    ]
+    lines += [f'        w{i} = {message_word(i, f"u{i}")}' for i in range(digest_words)]
+    lines += ['        ' + line for line in padding]
+    lines.append(f'        {", ".join(rounds.working)} = {inner}')
+    lines += ['        ' + line for line in rounds.body]
+    # The outer hash of the inner digest
+    lines += [f'        w{i} = {message_word(i, f"(i{i} + {rounds.final[i]}) & {mask}")}' for i in range(digest_words)]
+    lines += ['        ' + line for line in padding]
+    lines.append(f'        {", ".join(rounds.working)} = {outer}')
+    lines += ['        ' + line for line in rounds.body]
+    lines += [f'        u{i} = (o{i} + {rounds.final[i]}) & {masks[i]}' for i in range(digest_words)]
+    lines += [f'        x{i} ^= u{i}' for i in range(digest_words)]
+    lines.append(f'    return {", ".join(x)},')
+    return _compile(rounds, '\n'.join(lines) + '\n', 'loop', {})
+
+
+def _fold(lines: _List[str], known: _Dict[str, int]) -> _List[str]:
+    """
+    Evaluates the lines whose operands are all known and inlines the known values into the other lines.
+
+    :param lines: Generated `name = expression` lines.
+    :param known: The known values by variable name, updated in place.
+    :return: The lines left to run.
+    """
+    result = []
+    for line in lines:
+        target, expression = line.split(' = ', 1)
+        names = _NAME.findall(expression)
+        if all(name in known for name in names):
+            known[target] = eval(expression, {}, {name: known[name] for name in names})
+            continue
+        expression = _NAME.sub(lambda match: f'({known[match.group()]:#x})' if match.group() in known
+                               else match.group(), expression)
+        result.append(f'{target} = {expression}')
+        known.pop(target, None)
+    return result
+
+
+def _prune(lines: _List[str], live: _List[str]) -> _List[str]:
+    """
+    Removes the lines whose results are never used.
+
+    :param lines: Generated `name = expression` lines.
+    :param live: The names used after the lines.
+    :return: The lines that are needed.
+    """
+    live = set(live)
+    result = []
+    for line in reversed(lines):
+        target, expression = line.split(' = ', 1)
+        if target not in live:
+            continue
+        live.discard(target)
+        live.update(_NAME.findall(expression))
+        result.append(line)
+    result.reverse()
+    return result
+
+
+def _operand(value: _Union[int, str]) -> str:
+    return f'({value:#x})' if isinstance(value, int) else value
+
+
+def nonce_kernel(rounds: Rounds, state: _Sequence[int], blocks: _Sequence[_Sequence[int]],
+                 nonce_words: _Sequence[_Dict[int, _Tuple[int, int, int]]], check_words: int, limit: int) -> _Callable:
+    """
+    Generates the nonce search loop of a proof of work:
+
+        search(start, stop) -> the first nonce in range(start, stop) that meets the target, or None
+
+    The message is a constant prefix followed by the nonce and the padding. The complete blocks of the prefix are
+    already compressed into `state`, so every attempt only compresses the last block(s). Everything in the first of
+    them that does not depend on the nonce(the message schedule words and the rounds before the first nonce word) is
+    computed once, when the loop is generated.
+
+    :param rounds: The compression of the hash algorithm.
+    :param state: The state after the complete blocks of the prefix.
+    :param blocks: The sixteen words of every last block, with zeros in place of the nonce bytes.
+    :param nonce_words: For every last block, the words holding nonce bytes: {index: (shift, mask, position)}, the
+        word is `constant | ((nonce >> shift) & mask) << position`.
+    :param check_words: The number of leading digest words that are compared with the limit.
+    :param limit: The nonce is accepted when the leading digest words(as one big-endian number) are below it.
+    :return: The search function.
+    """
+    mask = rounds.mask
+    size = len(rounds.working)
+    bits = _struct.calcsize(rounds.word_format[-1]) * 8
+    little = rounds.word_format[0] == '<'
+    lines = [
+        'def search(start, stop):',
+        '    for nonce in range(start, stop):',
+    ]
+    body = []
+    # The state before the block, as known values or variable names
+    chain: _List[_Union[int, str]] = list(state)
+    for index, (block, words) in enumerate(zip(blocks, nonce_words)):
+        known = {f'w{i}': block[i] for i in range(16) if i not in words}
+        for i, (shift, word_mask, position) in words.items():
+            body.append(f'w{i} = {block[i]:#x} | ((nonce >> {shift}) & {word_mask:#x}) << {position}')
+        for name, value in zip(rounds.working, chain):
+            if isinstance(value, int):
+                known[name] = value
+            else:
+                body.append(f'{name} = {value}')
+        body += _fold(rounds.body, known)
+
+        def final(i: int) -> str:
+            # The sum of the state word and the final working variable
+            value = known.get(rounds.final[i], rounds.final[i])
+            return f'({_operand(chain[i])} + {_operand(value)}) & {mask}'
+
+        if index < len(blocks) - 1:
+            body += [f't{i} = {final(i)}' for i in range(size)]
+            chain = [f't{i}' for i in range(size)]
+        else:
+            checked = []
+            for i in range(check_words):
+                word = f'({final(i)})'
+                if little:
+                    word = f"_from_bytes({word}.to_bytes({bits // 8}, 'little'), 'big')"
+                checked.append(word)
+            value = checked[0]
+            for word in checked[1:]:
+                value = f'({value}) << {bits} | {word}'
+            # Only the words that are checked are computed
+            body = _prune(body, _NAME.findall(value))
+            body.append(f'if {value} < {limit:#x}:')
+            body.append('    return nonce')
+    lines += ['        ' + line for line in body]
+    lines.append('    return None')
+    return _compile(rounds, '\n'.join(lines) + '\n', 'search', {'_from_bytes': int.from_bytes})
+
+
+def fixed_kernel(rounds: Rounds, state: _Sequence[int], blocks: _Sequence[_Sequence[_Optional[int]]]) -> _Callable:
+    """
+    Generates the compression of a message of a fixed length:
+
+        compress(words) -> the state words after the last block
+
+    The constant words of the blocks(the padding and the length) are inlined, so everything that only depends on them
+    and on the initial state(e.g. the whole message schedule of a padding block) is computed once, when the function
+    is generated.
+
+    :param rounds: The compression of the hash algorithm.
+    :param state: The initial state.
+    :param blocks: The sixteen words of every block: an int for a constant word or None for a word read from `words`,
+        in order.
+    :return: The compress function.
+    """
+    mask = rounds.mask
+    size = len(rounds.working)
+    count = sum(word is None for block in blocks for word in block)
+    lines = [
+        'def compress(words):',
+        f'    {", ".join(f"x{i}" for i in range(count))}, = words',
+    ]
+    body = []
+    index = 0
+    chain: _List[_Union[int, str]] = list(state)
+    for block in blocks:
+        known = {}
+        for i, word in enumerate(block):
+            if word is None:
+                body.append(f'w{i} = x{index}')
+                index += 1
+            else:
+                known[f'w{i}'] = word
+        for name, value in zip(rounds.working, chain):
+            if isinstance(value, int):
+                known[name] = value
+            else:
+                body.append(f'{name} = {value}')
+        body += _fold(rounds.body, known)
+        body += [f't{i} = ({_operand(chain[i])} + {_operand(known.get(rounds.final[i], rounds.final[i]))}) & {mask}'
+                 for i in range(size)]
+        chain = [f't{i}' for i in range(size)]
+    lines += ['    ' + line for line in body]
+    lines.append(f'    return {", ".join(chain)},')
+    return _compile(rounds, '\n'.join(lines) + '\n', 'compress', {})
@@ -1,7 +1,8 @@
 # cryptwentyone.Hash.MD5.py
 # CodeWriter21
 
-from .Hash import Hash
+from .Hash import Hash, _register
+from .Kernels import md5_kernel
 
 __all__ = ['MD5Python']
 
@@ -36,12 +37,19 @@ WORD_C = 0x98badcfe
 WORD_D = 0x10325476
 
 
+@_register
 class MD5Python(Hash):
+    __slots__ = ('a0', 'b0', 'c0', 'd0')
+
     a0: int
     b0: int
     c0: int
     d0: int
     name: str = 'md5'
+    digest_size: int = 16
+    length_byteorder: str = 'little'
+    _state_names = ('a0', 'b0', 'c0', 'd0')
+    _compress = staticmethod(md5_kernel(K, s))
 
     def _initialize_variables(self):
         self.a0: int = WORD_A
@@ -55,19 +63,10 @@ class MD5Python(Hash):
 
         :return: The MD5 hash of the message.
         """
-        # Pad the message with a 1 bit followed by 0 bits.
-        message = self.message + b"\x80"  # 0b10000000
-
-        # Pad the message with 0 bits until its length is a multiple of 512 bits.
-        modulo_length = len(message) % 64
-        message += b"\x00" * ((56 - modulo_length) if modulo_length <= 56 else (56 + 64 - modulo_length))
+        message = self._preprocess()
 
-        # Append a 64-bit representation of the original message's length
-        message += ((len(self.message) * 8) % 2 ** 64).to_bytes(8, 'little')
-
-        # Process the padded message in successive 512-bit chunks.
-        for i in range(0, len(message), 64):
-            self._process_chunk(message[i:i + 64])
+        # Process the padded last block(s) in successive 512-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.a0.to_bytes(4, 'little') + self.b0.to_bytes(4, 'little') + self.c0.to_bytes(4, 'little') + \
@@ -115,6 +114,3 @@ class MD5Python(Hash):
         self.b0 = self.modular_add(self.b0, b)
         self.c0 = self.modular_add(self.c0, c)
         self.d0 = self.modular_add(self.d0, d)
-
-    def __repr__(self):
-        return f"MD5Python(message={self.message!r}, hash={str(self)!r})"
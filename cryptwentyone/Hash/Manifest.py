@@ -0,0 +1,250 @@
+# cryptwentyone.Hash.Manifest.py
+# CodeWriter21
+
+import os as _os
+import re as _re
+
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor, wait as _wait, \
+    FIRST_COMPLETED as _FIRST_COMPLETED
+from typing import Union as _Union, Type as _Type, Optional as _Optional, List as _List, Tuple as _Tuple, \
+    Iterator as _Iterator, Sequence as _Sequence, Dict as _Dict, NamedTuple as _NamedTuple, TextIO as _TextIO
+
+from .Hash import Hash, get_algorithm, DEFAULT_CHUNK_SIZE
+from .Cache import DigestCache, file_identity as _file_identity
+from .Multi import MultiHash
+
+__all__ = ['ManifestEntry', 'hash_tree', 'write_manifest']
+
+# Files smaller than this are hashed in batches, so that one task is not a single tiny file.
+SMALL_FILE_SIZE = 1 << 20  # 1 MiB
+# A batch of small files is closed when it reaches either limit.
+BATCH_BYTES = 4 << 20  # 4 MiB
+BATCH_FILES = 256
+
+# A file found by the walk: the relative path, the size and the identity(see `file_identity`).
+_File = _Tuple[str, int, _Tuple[int, int, int, int]]
+
+
+def _escape_path(path: str) -> _Tuple[str, str]:
+    """
+    Escapes a path like coreutils does in manifests and in the output of --check.
+
+    :return: The line prefix('\\' if the path was escaped) and the escaped path.
+    """
+    if '\\' not in path and '\n' not in path and '\r' not in path:
+        return '', path
+    return '\\', path.replace('\\', '\\\\').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def _unescape_path(path: str) -> str:
+    """
+    Reverses `_escape_path` for a path read from a manifest line starting with '\\'.
+    """
+    return _re.sub(r'\\(.)', lambda match: {'n': '\n', 'r': '\r'}.get(match.group(1), match.group(1)), path)
+
+
+class ManifestEntry(_NamedTuple):
+    path: str
+    size: int
+    # Maps the name of every algorithm to the hexadecimal digest of the file
+    digests: _Dict[str, str]
+    # The error message if the file could not be read
+    error: _Optional[str] = None
+
+
+def _hash_one(path: str, classes: _Sequence[_Type[Hash]], buffer: bytearray) -> _List[Hash]:
+    """
+    Hashes a file with several algorithms, reading it once.
+
+    :param path: The path of the file.
+    :param classes: The hash classes.
+    :param buffer: A reusable read buffer.
+    :return: The hash objects of the file content.
+    """
+    multi = MultiHash(classes)
+    view = memoryview(buffer)
+    with open(path, 'rb') as file:
+        while True:
+            n = file.readinto(buffer)
+            if not n:
+                break
+            multi.update(view[:n])
+    return [multi[cls] for cls in classes]
+
+
+def _hash_batch(root: str, files: _List[_File], classes: _Sequence[_Type[Hash]],
+                check_identity: bool = False) -> _List[_Tuple[ManifestEntry, bool]]:
+    """
+    Hashes a batch of files.
+
+    :param root: The directory the paths are relative to.
+    :param files: The files found by the walk.
+    :param classes: The hash classes.
+    :param check_identity: Checks whether every file is still the version found by the walk, for the digest cache.
+    :return: The manifest entries, each with whether its digests can be cached(False if the identity was not checked,
+        the file changed after the walk or could not be read).
+    """
+    buffer = bytearray(DEFAULT_CHUNK_SIZE)
+    entries = []
+    for path, size, identity in files:
+        full_path = _os.path.join(root, path)
+        try:
+            hashers = _hash_one(full_path, classes, buffer)
+            unchanged = check_identity and _file_identity(_os.stat(full_path, follow_symlinks=False)) == identity
+            entries.append((ManifestEntry(path, size, {hasher.name: hasher.hexdigest() for hasher in hashers}),
+                            unchanged))
+        except OSError as e:
+            entries.append((ManifestEntry(path, size, {}, str(e)), False))
+    return entries
+
+
+def _walk(root: str) -> _List[_File]:
+    """
+    Lists the regular files under a directory.
+
+    :param root: The directory.
+    :return: The relative paths(with '/' separators), sizes and identities of the files.
+    """
+    files = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(_os.scandir(directory))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    path = _os.path.relpath(entry.path, root).replace(_os.sep, '/')
+                    stat = entry.stat(follow_symlinks=False)
+                    files.append((path, stat.st_size, _file_identity(stat)))
+            except OSError:
+                continue
+    return files
+
+
+def _schedule(files: _List[_File]) -> _List[_List[_File]]:
+    """
+    Splits the files into tasks: the largest files first, one task each, then the small files in batches.
+
+    :param files: The files found by the walk.
+    :return: The tasks in the order they should start.
+    """
+    files = sorted(files, key=lambda file: file[1], reverse=True)
+    tasks = []
+    batch = []
+    batch_bytes = 0
+    for file in files:
+        if file[1] >= SMALL_FILE_SIZE:
+            tasks.append([file])
+            continue
+        batch.append(file)
+        batch_bytes += file[1]
+        if batch_bytes >= BATCH_BYTES or len(batch) >= BATCH_FILES:
+            tasks.append(batch)
+            batch = []
+            batch_bytes = 0
+    if batch:
+        tasks.append(batch)
+    return tasks
+
+
+def hash_tree(root: _Union[str, _os.PathLike], algorithms: _Sequence[_Union[str, _Type[Hash]]] = ('sha256',),
+              workers: _Optional[int] = None, cache: _Optional[DigestCache] = None) -> _Iterator[ManifestEntry]:
+    """
+    Hashes every file under a directory on a pool of processes and yields the manifest entries as soon as they are
+    ready(not in path order).
+
+    The largest files are started first and the small ones are hashed in batches, idle workers take the next task from
+    the shared queue.
+
+    :param root: The directory to hash.
+    :param algorithms: The names of the algorithms(e.g. 'sha256') or Hash subclasses, each file is read once for all of
+        them.
+    :param workers: The number of processes, the number of CPUs by default. 1 hashes the files in this process.
+    :param cache: A digest cache, the unchanged files that are already in the cache are yielded first without being
+        read and the rest are added to the cache.
+    :return: An iterator over the manifest entries.
+    """
+    root = _os.fspath(root)
+    if isinstance(algorithms, (str, type)):
+        algorithms = [algorithms]
+    classes = [get_algorithm(algorithm) for algorithm in algorithms]
+    files = _walk(root)
+    if workers is None:
+        workers = _os.cpu_count() or 1
+
+    if cache is not None:
+        missing = []
+        for file in files:
+            digests = [cache.lookup(file[2], cls) for cls in classes]
+            if any(digest is None for digest in digests):
+                missing.append(file)
+                continue
+            yield ManifestEntry(file[0], file[1], {cls.name: digest.hex() for cls, digest in zip(classes, digests)})
+        files = missing
+    tasks = _schedule(files)
+    identities = {file[0]: file[2] for file in files} if cache is not None else None
+
+    for entry, unchanged in _hash_tasks(root, tasks, classes, workers, cache is not None):
+        if unchanged:
+            for cls in classes:
+                cache.store(identities[entry.path], cls, bytes.fromhex(entry.digests[cls.name]))
+        yield entry
+    if cache is not None:
+        cache.flush()
+
+
+def _hash_tasks(root: str, tasks: _List[_List[_File]], classes: _List[_Type[Hash]], workers: int,
+                check_identity: bool) -> _Iterator[_Tuple[ManifestEntry, bool]]:
+    """
+    Runs the tasks of `hash_tree`, in this process if workers is 1 or on a pool of processes.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield from _hash_batch(root, task, classes, check_identity)
+        return
+
+    # Keep a bounded number of tasks in flight, so the manifest streams out and memory stays flat on huge trees.
+    with _ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        tasks = iter(tasks)
+        for task in tasks:
+            pending.add(executor.submit(_hash_batch, root, task, classes, check_identity))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = _wait(pending, return_when=_FIRST_COMPLETED)
+            for future in done:
+                task = next(tasks, None)
+                if task is not None:
+                    pending.add(executor.submit(_hash_batch, root, task, classes, check_identity))
+                yield from future.result()
+
+
+def write_manifest(root: _Union[str, _os.PathLike], file: _TextIO, algorithm: _Union[str, _Type[Hash]] = 'sha256',
+                   workers: _Optional[int] = None, cache: _Optional[DigestCache] = None) -> int:
+    """
+    Writes a sha256sum-style manifest(`<hexdigest>  <path>` lines) of every file under a directory, line by line as the
+    files are hashed. Paths containing a backslash or a line break are escaped and their lines start with '\\', like
+    sha256sum does.
+
+    :param root: The directory to hash.
+    :param file: The text file to write the manifest to.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param workers: The number of processes, the number of CPUs by default.
+    :param cache: A digest cache, see `hash_tree`.
+    :return: The number of files that could not be read.
+    """
+    cls = get_algorithm(algorithm)
+    errors = 0
+    for entry in hash_tree(root, [cls], workers, cache):
+        if entry.error is not None:
+            errors += 1
+            continue
+        prefix, path = _escape_path(entry.path)
+        file.write(f'{prefix}{entry.digests[cls.name]}  {path}\n')
+    return errors
@@ -0,0 +1,93 @@
+# cryptwentyone.Hash.Midstate.py
+# CodeWriter21
+
+import threading as _threading
+
+from collections import OrderedDict as _OrderedDict
+from typing import Union as _Union, Type as _Type, Tuple as _Tuple, Optional as _Optional, Dict as _Dict
+
+from .Hash import Hash, get_algorithm
+
+__all__ = ['MidstateCache', 'default_cache', 'with_prefix']
+
+
+class MidstateCache:
+    """
+    A least-recently-used cache of hash objects that have already processed a prefix.
+
+    Only the state words after the complete blocks of the prefix and the last incomplete block are stored, so hashing
+    `prefix + body` from the cache costs only the blocks of the body.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        :param maxsize: The maximum number of prefixes to keep, the least recently used one is evicted first.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self._entries: _Dict[_Tuple[_Type[Hash], bytes], Hash] = _OrderedDict()
+        self._lock = _threading.Lock()
+
+    def get(self, algorithm: _Union[str, _Type[Hash]], prefix: _Union[str, bytes]) -> Hash:
+        """
+        Returns a new hash object that has already processed the prefix.
+
+        :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        :param prefix: The prefix of the message.
+        :return: A hash object that can be updated with the rest of the message.
+        """
+        cls = get_algorithm(algorithm)
+        prefix = Hash._as_view(prefix).tobytes()
+        key = (cls, prefix)
+        with self._lock:
+            midstate = self._entries.get(key)
+            if midstate is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return midstate.copy()
+            self.misses += 1
+
+        midstate = cls(prefix)
+        with self._lock:
+            self._entries[key] = midstate
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return midstate.copy()
+
+    def clear(self) -> None:
+        """
+        Removes every cached prefix and resets the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f"MidstateCache(maxsize={self.maxsize}, size={len(self)}, hits={self.hits}, misses={self.misses})"
+
+
+default_cache = MidstateCache()
+
+
+def with_prefix(algorithm: _Union[str, _Type[Hash]], prefix: _Union[str, bytes], message: _Union[str, bytes] = b'',
+                cache: _Optional[MidstateCache] = None) -> Hash:
+    """
+    Hashes `prefix + message` reusing the cached state of the prefix.
+
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param prefix: The common prefix.
+    :param message: The rest of the message.
+    :param cache: The cache to use, `default_cache` by default.
+    :return: The hash object, it can still be updated.
+    """
+    hasher = (default_cache if cache is None else cache).get(algorithm, prefix)
+    hasher.update(message)
+    return hasher
@@ -0,0 +1,168 @@
+# cryptwentyone.Hash.Multi.py
+# CodeWriter21
+
+import os as _os
+import math as _math
+import binascii as _binascii
+
+from typing import Union as _Union, Type as _Type, Sequence as _Sequence, Dict as _Dict, List as _List, \
+    BinaryIO as _BinaryIO
+
+from .Hash import Hash, get_algorithm, DEFAULT_CHUNK_SIZE, _Message
+
+__all__ = ['MultiHash']
+
+
+class MultiHash:
+    """
+    Computes the digests of several algorithms in a single pass over the message, e.g. MD5, SHA1, SHA256 and SHA512
+    of a blob.
+
+    The message is sliced once into runs of complete blocks of every algorithm(the least common multiple of the block
+    sizes, 128 bytes for the built-in algorithms), which are passed straight to every compression function. Only one
+    partial block is kept for all the algorithms.
+    """
+
+    def __init__(self, algorithms: _Sequence[_Union[str, _Type[Hash]]] = ('md5', 'sha1', 'sha256', 'sha512'),
+                 message: _Message = b''):
+        """
+        :param algorithms: The names of the algorithms(e.g. 'sha256') or Hash subclasses.
+        :param message: The initial message.
+        """
+        if isinstance(algorithms, (str, type)):
+            algorithms = [algorithms]
+        self._hashers: _List[Hash] = []
+        for algorithm in algorithms:
+            cls = get_algorithm(algorithm)
+            if all(hasher.name != cls.name for hasher in self._hashers):
+                self._hashers.append(cls())
+        if not self._hashers:
+            raise ValueError("At least one algorithm is required")
+        self.block_size: int = 1
+        for hasher in self._hashers:
+            self.block_size = self.block_size * hasher.block_size // _math.gcd(self.block_size, hasher.block_size)
+        self._buffer: bytes = b''
+        self.update(message)
+
+    @classmethod
+    def from_file(cls, path: _Union[str, _os.PathLike],
+                  algorithms: _Sequence[_Union[str, _Type[Hash]]] = ('md5', 'sha1', 'sha256', 'sha512'),
+                  chunk_size: int = DEFAULT_CHUNK_SIZE) -> 'MultiHash':
+        """
+        Hashes a file with several algorithms, reading it once.
+
+        :param path: The path of the file.
+        :param algorithms: The names of the algorithms(e.g. 'sha256') or Hash subclasses.
+        :param chunk_size: The size of the reusable read buffer.
+        :return: The MultiHash object of the file content.
+        """
+        self = cls(algorithms)
+        with open(path, 'rb') as file:
+            self.update_file(file, chunk_size)
+        return self
+
+    @property
+    def names(self) -> _List[str]:
+        """
+        The names of the algorithms.
+        """
+        return [hasher.name for hasher in self._hashers]
+
+    def _process_blocks(self, data: _Union[bytes, memoryview]) -> None:
+        if not data:
+            return
+        for hasher in self._hashers:
+            hasher._length += len(data)
+            if hasher.instrumentation is not None:
+                hasher.instrumentation.record_bytes(hasher, len(data))
+            hasher._process_blocks(data)
+
+    def update(self, message: _Message) -> None:
+        """
+        Feeds more data to every algorithm.
+
+        :param message: The data to add to the message(a string or any bytes-like object).
+        """
+        view = Hash._as_view(message)
+        length = len(view)
+        block_size = self.block_size
+
+        start = 0
+        if self._buffer:
+            # Complete the block left from the previous update
+            start = block_size - len(self._buffer)
+            if length < start:
+                self._buffer += view
+                return
+            self._process_blocks(self._buffer + view[:start])
+
+        end = length - (length - start) % block_size
+        self._process_blocks(view[start:end])
+        self._buffer = view[end:].tobytes()
+
+    def update_file(self, file: _BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """
+        Feeds the rest of an open binary file to every algorithm, reading it into a single reusable buffer.
+
+        :param file: The file object to read.
+        :param chunk_size: The size of the reusable read buffer.
+        """
+        readinto = getattr(file, 'readinto', None)
+        if readinto is None:
+            for chunk in iter(lambda: file.read(chunk_size), b''):
+                self.update(chunk)
+            return
+
+        buffer = bytearray(max(chunk_size - chunk_size % self.block_size, self.block_size))
+        view = memoryview(buffer)
+        while True:
+            n = readinto(buffer)
+            if not n:
+                break
+            self.update(view[:n])
+
+    def copy(self) -> 'MultiHash':
+        """
+        Returns a copy of the MultiHash object. Feeding data to the copy does not affect the original object.
+
+        :return: A copy of the MultiHash object.
+        """
+        other = self.__class__.__new__(self.__class__)
+        other._hashers = [hasher.copy() for hasher in self._hashers]
+        other.block_size = self.block_size
+        other._buffer = self._buffer
+        return other
+
+    def __getitem__(self, name: _Union[str, _Type[Hash]]) -> Hash:
+        """
+        Returns the hash object of an algorithm, with the whole message fed to it.
+
+        :param name: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+        :return: A new hash object, it can still be updated.
+        """
+        name = get_algorithm(name).name
+        for hasher in self._hashers:
+            if hasher.name == name:
+                hasher = hasher.copy()
+                hasher.update(self._buffer)
+                return hasher
+        raise KeyError(name)
+
+    def digests(self) -> _Dict[str, bytes]:
+        """
+        Returns the digests of the data fed to the object so far.
+
+        :return: The digests by algorithm name.
+        """
+        return {name: self[name].digest() for name in self.names}
+
+    def hexdigests(self) -> _Dict[str, str]:
+        """
+        Returns the digests of the data fed to the object so far as hexadecimal strings.
+
+        :return: The hexadecimal digests by algorithm name.
+        """
+        return {name: _binascii.hexlify(digest).decode() for name, digest in self.digests().items()}
+
+    def __repr__(self):
+        return f"MultiHash({self.hexdigests()!r})"
@@ -0,0 +1,109 @@
+# cryptwentyone.Hash.PBKDF2.py
+# CodeWriter21
+
+import os as _os
+import struct as _struct
+import functools as _functools
+
+from itertools import repeat as _repeat
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from typing import Union as _Union, Type as _Type, Optional as _Optional, Callable as _Callable
+
+from .Hash import Hash, get_algorithm
+from .HMAC import HMAC
+from .Kernels import pbkdf2_kernel
+
+__all__ = ['pbkdf2_hmac']
+
+
+@_functools.lru_cache(maxsize=None)
+def _iteration_loop(cls: _Type[Hash]) -> _Optional[_Callable]:
+    """
+    Generates the PBKDF2 iteration loop of a hash class.
+
+    :param cls: The hash class.
+    :return: The loop function, or None if the class has no generated kernel.
+    """
+    if cls._compress is None:
+        return None
+    rounds = cls._compress.rounds
+    # A padded block holding a digest(zeros in place of the digest)
+    block = _struct.unpack(rounds.word_format,
+                           b'\x00' * cls.digest_size + cls._padding(cls.block_size + cls.digest_size))
+    return pbkdf2_kernel(rounds, block, cls.digest_size)
+
+
+def _digest_format(cls: _Type[Hash]) -> str:
+    """
+    Returns the struct format of the digest words, the last one may be only partly made of the digest(e.g. SHA512/224).
+    """
+    word_format = cls._compress.rounds.word_format
+    return f'{word_format[0]}{-(-cls.digest_size // _struct.calcsize(word_format[-1]))}{word_format[-1]}'
+
+
+def _pbkdf2_block(cls: _Type[Hash], password: bytes, salt: bytes, iterations: int, index: int) -> bytes:
+    """
+    Computes one block of the derived key: U1 ^ U2 ^ ... ^ Uc.
+
+    :param cls: The hash class.
+    :param password: The password.
+    :param salt: The salt.
+    :param iterations: The number of iterations(c).
+    :param index: The 1-based index of the block.
+    :return: The block.
+    """
+    mac = HMAC(password, digestmod=cls)
+    u = mac.sign(salt + index.to_bytes(4, 'big'))
+    if iterations == 1:
+        return u
+
+    loop = _iteration_loop(mac.digestmod)
+    if loop is None:
+        result = int.from_bytes(u, 'big')
+        for _ in range(iterations - 1):
+            u = mac.sign(u)
+            result ^= int.from_bytes(u, 'big')
+        return result.to_bytes(len(u), 'big')
+
+    # Both states come from the padded keys, the loop only runs the two compressions of every iteration.
+    digest_format = _digest_format(mac.digestmod)
+    u = u.ljust(_struct.calcsize(digest_format), b'\x00')
+    words = loop(mac._inner_pad._get_state(), mac._outer_pad._get_state(), _struct.unpack(digest_format, u),
+                 iterations - 1)
+    return _struct.pack(digest_format, *words)[:mac.digest_size]
+
+
+def pbkdf2_hmac(hash_name: _Union[str, _Type[Hash]], password: _Union[str, bytes], salt: _Union[str, bytes],
+                iterations: int, dklen: _Optional[int] = None, workers: _Optional[int] = None) -> bytes:
+    """
+    Derives a key from a password using PBKDF2 with HMAC(RFC 8018).
+
+    :param hash_name: The name of the hash algorithm(e.g. 'sha256') or a Hash subclass.
+    :param password: The password.
+    :param salt: The salt.
+    :param iterations: The number of iterations.
+    :param dklen: The length of the derived key, the digest size of the algorithm by default.
+    :param workers: The number of processes computing the blocks of the key when it is longer than one digest. By
+        default, one process per block up to the number of CPUs; 1 computes them in this process.
+    :return: The derived key.
+    """
+    cls = get_algorithm(hash_name)
+    password = Hash._as_view(password).tobytes()
+    salt = Hash._as_view(salt).tobytes()
+    if iterations < 1:
+        raise ValueError("iterations must be at least 1")
+    if dklen is None:
+        dklen = cls.digest_size
+    if dklen < 1:
+        raise ValueError("dklen must be at least 1")
+
+    n_blocks = -(-dklen // cls.digest_size)
+    arguments = (_repeat(cls), _repeat(password), _repeat(salt), _repeat(iterations), range(1, n_blocks + 1))
+    if workers is None:
+        workers = min(n_blocks, _os.cpu_count() or 1)
+    if n_blocks > 1 and workers > 1:
+        with _ProcessPoolExecutor(max_workers=workers) as executor:
+            blocks = list(executor.map(_pbkdf2_block, *arguments))
+    else:
+        blocks = list(map(_pbkdf2_block, *arguments))
+    return b''.join(blocks)[:dklen]
@@ -0,0 +1,59 @@
+# cryptwentyone.Hash.Parallel.py
+# CodeWriter21
+
+# Picks the kind of workers for parallel hashing. On free-threaded(no-GIL) CPython builds, e.g. 3.13t, the pure Python
+# compressions of several threads run at the same time, so threads are used: they share the messages instead of
+# pickling them and start instantly. With the GIL only one thread runs Python code at a time, so processes are used.
+#
+# Threads never share a hash object: every worker creates its own, and the state the hash objects share is either
+# read-only(the round constants, the generated kernels, the algorithm registry) or behind a lock(instrumentation,
+# backends, midstate caches).
+
+import os as _os
+import sys as _sys
+
+from concurrent.futures import Executor as _Executor, ThreadPoolExecutor as _ThreadPoolExecutor, \
+    ProcessPoolExecutor as _ProcessPoolExecutor
+from typing import Optional as _Optional
+
+__all__ = ['gil_enabled', 'default_executor', 'create_executor']
+
+EXECUTORS = ('auto', 'thread', 'process')
+
+
+def gil_enabled() -> bool:
+    """
+    Tells whether the global interpreter lock is enabled. It is always enabled before Python 3.13, and it may be enabled
+    again at runtime on free-threaded builds(e.g. by importing an extension module that does not support running
+    without it, or with PYTHON_GIL=1).
+
+    :return: False if threads run Python code in parallel.
+    """
+    is_gil_enabled = getattr(_sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def default_executor() -> str:
+    """
+    Returns the kind of workers 'auto' stands for: 'thread' without the GIL, 'process' with it.
+    """
+    return 'process' if gil_enabled() else 'thread'
+
+
+def create_executor(executor: str = 'auto', workers: _Optional[int] = None) -> _Executor:
+    """
+    Creates a pool of workers.
+
+    :param executor: 'thread', 'process' or 'auto'(see `default_executor`).
+    :param workers: The number of workers, the number of CPUs by default.
+    :return: The executor.
+    """
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor!r}, expected one of {', '.join(EXECUTORS)}")
+    if executor == 'auto':
+        executor = default_executor()
+    if workers is None:
+        workers = _os.cpu_count() or 1
+    if executor == 'thread':
+        return _ThreadPoolExecutor(max_workers=workers, thread_name_prefix='cryptwentyone')
+    return _ProcessPoolExecutor(max_workers=workers)
@@ -1,7 +1,8 @@
 # cryptwentyone.Hash.SHA1.py
 # CodeWriter21
 
-from .Hash import Hash
+from .Hash import Hash, _register
+from .Kernels import sha1_kernel
 
 __all__ = ['SHA1Python']
 
@@ -12,14 +13,23 @@ H2 = 0x98BADCFE
 H3 = 0x10325476
 H4 = 0xC3D2E1F0
 
+# Round constants for SHA-1, one for every 20 rounds.
+K = [0x5A827999, 0x6ED9EBA1, 0x8F1BBCDC, 0xCA62C1D6]
 
+
+@_register
 class SHA1Python(Hash):
+    __slots__ = ('h0', 'h1', 'h2', 'h3', 'h4')
+
     h0: int
     h1: int
     h2: int
     h3: int
     h4: int
     name: str = 'sha1'
+    digest_size: int = 20
+    _state_names = ('h0', 'h1', 'h2', 'h3', 'h4')
+    _compress = staticmethod(sha1_kernel(K))
 
     def _initialize_variables(self):
         self.h0: int = H0
@@ -34,18 +44,10 @@ class SHA1Python(Hash):
 
         :return: The SHA1 hash of the message.
         """
-        # Pad the message with a 1 bit followed by 0 bits.
-        message = self.message + b"\x80"  # 0b10000000
-
-        # Pad the message with 0 bits until its length is a multiple of 512 bits.
-        message += b"\x00" * (63 - (len(message) + 8) % 64)
+        message = self._preprocess()
 
-        # Append a 64-bit representation of the original message's length
-        message += self.ml.to_bytes(8, 'big')
-
-        # Process the padded message in successive 512-bit chunks.
-        for i in range(0, len(message), 64):
-            self._process_chunk(message[i:i + 64])
+        # Process the padded last block(s) in successive 512-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.h0.to_bytes(4, 'big') + self.h1.to_bytes(4, 'big') + self.h2.to_bytes(4, 'big') + self.h3.to_bytes(
@@ -101,6 +103,3 @@ class SHA1Python(Hash):
         self.h2 = self.modular_add(self.h2, c)
         self.h3 = self.modular_add(self.h3, d)
         self.h4 = self.modular_add(self.h4, e)
-
-    def __repr__(self):
-        return f"SHA1Python(message={self.message!r}, hash={str(self)!r})"
@@ -2,12 +2,15 @@
 # CodeWriter21
 from abc import ABC
 
-from .Hash import Hash
+from .Hash import Hash, _register
+from .Kernels import sha2_kernel
 
-__all__ = ['SHA256Python', 'SHA224Python', 'SHA384Python', 'SHA512Python']
+__all__ = ['SHA256Python', 'SHA224Python', 'SHA384Python', 'SHA512Python', 'SHA512_224Python', 'SHA512_256Python']
 
 
 class _SHA2Python(Hash, ABC):
+    __slots__ = ('h0', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7')
+
     k = [0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
          0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
          0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
@@ -28,6 +31,8 @@ class _SHA2Python(Hash, ABC):
     h6: int
     h7: int
     name: str = 'sha2'
+    _state_names = ('h0', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7')
+    _compress = staticmethod(sha2_kernel(k, 32, (2, 13, 22), (6, 11, 25), (7, 18, 3), (17, 19, 10)))
 
     def _initialize_variables(self):
         self.h0 = self.H0
@@ -39,23 +44,6 @@ class _SHA2Python(Hash, ABC):
         self.h6 = self.H6
         self.h7 = self.H7
 
-    def _preprocess(self):
-        """
-        Pads the message and adds the representation of length to it.
-
-        :return:
-        """
-        # Pad the message with a 1 bit followed by 0 bits.
-        message = self.message + b"\x80"  # 0b10000000
-
-        # Pad the message with 0 bits until its length is a multiple of 512 bits.
-        message += b"\x00" * (64 - (len(message) + 8) % 64)
-
-        # Append a 64-bit representation of the original message's length
-        message += self.ml.to_bytes(8, 'big')
-
-        return message
-
     def _process_chunk(self, chunk: bytes):
         """
         Processes a 512-bit chunk of the message.
@@ -110,11 +98,11 @@ class _SHA2Python(Hash, ABC):
         self.h6 = self.modular_add(self.h6, g)
         self.h7 = self.modular_add(self.h7, h)
 
-    def __repr__(self):
-        return f"SHA2Python(message={self.message!r}, hash={str(self)!r})"
-
 
+@_register
 class SHA224Python(_SHA2Python):
+    __slots__ = ()
+
     # Constant values for SHA-224
     H0 = 0xc1059ed8
     H1 = 0x367cd507
@@ -126,6 +114,7 @@ class SHA224Python(_SHA2Python):
     H7 = 0xbefa4fa4
 
     name: str = 'sha224'
+    digest_size: int = 28
 
     def _hash(self) -> bytes:
         """
@@ -135,20 +124,19 @@ class SHA224Python(_SHA2Python):
         """
         message = self._preprocess()
 
-        # Process the preprocessed message in successive 512-bit chunks.
-        for i in range(0, len(message), 64):
-            self._process_chunk(message[i:i + 64])
+        # Process the padded last block(s) in successive 512-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.h0.to_bytes(4, 'big') + self.h1.to_bytes(4, 'big') + self.h2.to_bytes(4, 'big') + \
                self.h3.to_bytes(4, 'big') + self.h4.to_bytes(4, 'big') + self.h5.to_bytes(4, 'big') + \
                self.h6.to_bytes(4, 'big')
 
-    def __repr__(self):
-        return f"SHA256Python(message={self.message!r}, hash={str(self)!r})"
-
 
+@_register
 class SHA256Python(_SHA2Python):
+    __slots__ = ()
+
     # Constant values for SHA-256
     H0 = 0x6a09e667
     H1 = 0xbb67ae85
@@ -160,6 +148,7 @@ class SHA256Python(_SHA2Python):
     H7 = 0x5be0cd19
 
     name: str = 'sha256'
+    digest_size: int = 32
 
     def _hash(self) -> bytes:
         """
@@ -169,20 +158,18 @@ class SHA256Python(_SHA2Python):
         """
         message = self._preprocess()
 
-        # Process the preprocessed message in successive 512-bit chunks.
-        for i in range(0, len(message), 64):
-            self._process_chunk(message[i:i + 64])
+        # Process the padded last block(s) in successive 512-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.h0.to_bytes(4, 'big') + self.h1.to_bytes(4, 'big') + self.h2.to_bytes(4, 'big') + \
                self.h3.to_bytes(4, 'big') + self.h4.to_bytes(4, 'big') + self.h5.to_bytes(4, 'big') + \
                self.h6.to_bytes(4, 'big') + self.h7.to_bytes(4, 'big')
 
-    def __repr__(self):
-        return f"SHA256Python(message={self.message!r}, hash={str(self)!r})"
-
 
 class _SHA2Python64(_SHA2Python, ABC):
+    __slots__ = ()
+
     k = [0x428a2f98d728ae22, 0x7137449123ef65cd, 0xb5c0fbcfec4d3b2f, 0xe9b5dba58189dbbc, 0x3956c25bf348b538,
          0x59f111f1b605d019, 0x923f82a4af194f9b, 0xab1c5ed5da6d8118, 0xd807aa98a3030242, 0x12835b0145706fbe,
          0x243185be4ee4b28c, 0x550c7dc3d5ffb4e2, 0x72be5d74f27b896f, 0x80deb1fe3b1696b1, 0x9bdc06a725c71235,
@@ -202,23 +189,9 @@ class _SHA2Python64(_SHA2Python, ABC):
 
     X = 0x10000000000000000  # 2**64
     default_n_bits: int = 64
-
-    def _preprocess(self):
-        """
-        Pads the message and adds the representation of length to it.
-
-        :return:
-        """
-        # Pad the message with a 1 bit followed by 0 bits.
-        message = self.message + b"\x80"  # 0b10000000
-
-        # Pad the message with 0 bits until its length is a multiple of 512 bits.
-        message += b"\x00" * (128 - (len(message) + 16) % 128)
-
-        # Append a 128-bit representation of the original message's length
-        message += self.ml.to_bytes(16, 'big')
-
-        return message
+    block_size: int = 128
+    length_size: int = 16
+    _compress = staticmethod(sha2_kernel(k, 64, (28, 34, 39), (14, 18, 41), (1, 8, 7), (19, 61, 6)))
 
     def _process_chunk(self, chunk: bytes):
         """
@@ -275,7 +248,10 @@ class _SHA2Python64(_SHA2Python, ABC):
         self.h7 = self.modular_add(self.h7, h)
 
 
+@_register
 class SHA384Python(_SHA2Python64):
+    __slots__ = ()
+
     # Constant values for SHA-384
     H0 = 0xcbbb9d5dc1059ed8
     H1 = 0x629a292a367cd507
@@ -287,6 +263,7 @@ class SHA384Python(_SHA2Python64):
     H7 = 0x47b5481dbefa4fa4
 
     name: str = 'sha384'
+    digest_size: int = 48
 
     def _hash(self) -> bytes:
         """
@@ -296,19 +273,18 @@ class SHA384Python(_SHA2Python64):
         """
         message = self._preprocess()
 
-        # Process the preprocessed message in successive 512-bit chunks.
-        for i in range(0, len(message), 128):
-            self._process_chunk(message[i:i + 128])
+        # Process the padded last block(s) in successive 1024-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.h0.to_bytes(8, 'big') + self.h1.to_bytes(8, 'big') + self.h2.to_bytes(8, 'big') + \
                self.h3.to_bytes(8, 'big') + self.h4.to_bytes(8, 'big') + self.h5.to_bytes(8, 'big')
 
-    def __repr__(self):
-        return f"SHA384Python(message={self.message!r}, hash={str(self)!r})"
-
 
+@_register
 class SHA512Python(_SHA2Python64):
+    __slots__ = ()
+
     # Constant values for SHA-512
     H0 = 0x6a09e667f3bcc908
     H1 = 0xbb67ae8584caa73b
@@ -320,6 +296,7 @@ class SHA512Python(_SHA2Python64):
     H7 = 0x5be0cd19137e2179
 
     name: str = 'sha512'
+    digest_size: int = 64
 
     def _hash(self) -> bytes:
         """
@@ -329,14 +306,76 @@ class SHA512Python(_SHA2Python64):
         """
         message = self._preprocess()
 
-        # Process the preprocessed message in successive 512-bit chunks.
-        for i in range(0, len(message), 128):
-            self._process_chunk(message[i:i + 128])
+        # Process the padded last block(s) in successive 1024-bit chunks.
+        self._process_blocks(message)
 
         # Return the result as bytes
         return self.h0.to_bytes(8, 'big') + self.h1.to_bytes(8, 'big') + self.h2.to_bytes(8, 'big') + \
                self.h3.to_bytes(8, 'big') + self.h4.to_bytes(8, 'big') + self.h5.to_bytes(8, 'big') + \
                self.h6.to_bytes(8, 'big') + self.h7.to_bytes(8, 'big')
 
-    def __repr__(self):
-        return f"SHA512Python(message={self.message!r}, hash={str(self)!r})"
+
+@_register
+class SHA512_224Python(_SHA2Python64):
+    __slots__ = ()
+
+    # Constant values for SHA-512/224(FIPS 180-4, 5.3.6.1)
+    H0 = 0x8c3d37c819544da2
+    H1 = 0x73e1996689dcd4d6
+    H2 = 0x1dfab7ae32ff9c82
+    H3 = 0x679dd514582f9fcf
+    H4 = 0x0f6d2b697bd44da8
+    H5 = 0x77e36f7304c48942
+    H6 = 0x3f9d85a86a1d36c8
+    H7 = 0x1112e6ad91d692a1
+
+    name: str = 'sha512_224'
+    digest_size: int = 28
+
+    def _hash(self) -> bytes:
+        """
+        Calculates the SHA512/224 hash of the message.
+
+        :return: The SHA512/224 hash of the message.
+        """
+        message = self._preprocess()
+
+        # Process the padded last block(s) in successive 1024-bit chunks.
+        self._process_blocks(message)
+
+        # Return the leftmost 224 bits of the result as bytes
+        return (self.h0.to_bytes(8, 'big') + self.h1.to_bytes(8, 'big') + self.h2.to_bytes(8, 'big') +
+                self.h3.to_bytes(8, 'big'))[:28]
+
+
+@_register
+class SHA512_256Python(_SHA2Python64):
+    __slots__ = ()
+
+    # Constant values for SHA-512/256(FIPS 180-4, 5.3.6.2)
+    H0 = 0x22312194fc2bf72c
+    H1 = 0x9f555fa3c84c64c2
+    H2 = 0x2393b86b6f53b151
+    H3 = 0x963877195940eabd
+    H4 = 0x96283ee2a88effe3
+    H5 = 0xbe5e1e2553863992
+    H6 = 0x2b0199fc2c85b8aa
+    H7 = 0x0eb72ddc81c52ca2
+
+    name: str = 'sha512_256'
+    digest_size: int = 32
+
+    def _hash(self) -> bytes:
+        """
+        Calculates the SHA512/256 hash of the message.
+
+        :return: The SHA512/256 hash of the message.
+        """
+        message = self._preprocess()
+
+        # Process the padded last block(s) in successive 1024-bit chunks.
+        self._process_blocks(message)
+
+        # Return the leftmost 256 bits of the result as bytes
+        return self.h0.to_bytes(8, 'big') + self.h1.to_bytes(8, 'big') + self.h2.to_bytes(8, 'big') + \
+               self.h3.to_bytes(8, 'big')
@@ -0,0 +1,155 @@
+# cryptwentyone.Hash.Tree.py
+# CodeWriter21
+
+# Tree hash format(version 1):
+#
+#   * The input is split into leaves of `leaf_size` bytes, the last leaf may be shorter. An empty input is a single
+#     empty leaf.
+#   * leaf digest = H(0x00 || leaf)
+#   * node digest = H(0x01 || left || right)
+#   * Every level is built by combining the digests of the level below in pairs, from left to right. When a level has
+#     an odd number of digests, the last one is moved up to the next level unchanged.
+#   * The root digest is the only digest of the top level.
+#
+# The root depends on the algorithm and on the leaf size, both must be the same to verify a tree hash. Leaf `i` covers
+# the bytes [i * leaf_size, (i + 1) * leaf_size) of the input, so a byte range can be checked by hashing only the leaves
+# it overlaps and comparing them with the digests returned by `leaf_digests`.
+
+import os as _os
+
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from typing import Union as _Union, Type as _Type, Optional as _Optional, List as _List, Sequence as _Sequence
+
+from .Hash import Hash, get_algorithm
+
+__all__ = ['tree_hash', 'leaf_digests', 'tree_root', 'hash_leaf']
+
+DEFAULT_LEAF_SIZE = 1 << 20  # 1 MiB
+LEAF_PREFIX = b'\x00'
+NODE_PREFIX = b'\x01'
+
+_Input = _Union[str, _os.PathLike, bytes, bytearray, memoryview]
+
+
+def hash_leaf(leaf: _Union[bytes, memoryview], algorithm: _Union[str, _Type[Hash]] = 'sha256') -> bytes:
+    """
+    Returns the digest of a leaf.
+
+    :param leaf: The content of the leaf.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :return: The leaf digest.
+    """
+    hasher = get_algorithm(algorithm)(LEAF_PREFIX)
+    hasher.update(leaf)
+    return hasher.digest()
+
+
+def tree_root(digests: _Sequence[bytes], algorithm: _Union[str, _Type[Hash]] = 'sha256') -> bytes:
+    """
+    Combines leaf digests into the root digest.
+
+    :param digests: The leaf digests in order.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :return: The root digest.
+    """
+    cls = get_algorithm(algorithm)
+    if not digests:
+        raise ValueError("A tree needs at least one leaf")
+    level = list(digests)
+    while len(level) > 1:
+        next_level = [cls(NODE_PREFIX + level[i] + level[i + 1]).digest() for i in range(0, len(level) - 1, 2)]
+        if len(level) % 2:
+            next_level.append(level[-1])
+        level = next_level
+    return level[0]
+
+
+def _hash_file_leaves(path: _Union[str, _os.PathLike], cls: _Type[Hash], leaf_size: int, first: int,
+                      count: int) -> _List[bytes]:
+    """
+    Hashes consecutive leaves of a file.
+
+    :param path: The path of the file.
+    :param cls: The hash class.
+    :param leaf_size: The size of a leaf.
+    :param first: The index of the first leaf.
+    :param count: The number of leaves.
+    :return: The leaf digests.
+    """
+    buffer = bytearray(leaf_size)
+    view = memoryview(buffer)
+    digests = []
+    with open(path, 'rb') as file:
+        file.seek(first * leaf_size)
+        for _ in range(count):
+            n = file.readinto(buffer)
+            # readinto may return less than asked before the end of the file
+            while n < leaf_size:
+                more = file.readinto(view[n:])
+                if not more:
+                    break
+                n += more
+            hasher = cls(LEAF_PREFIX)
+            hasher.update(view[:n])
+            digests.append(hasher.digest())
+    return digests
+
+
+def _hash_data_leaves(data: bytes, cls: _Type[Hash], leaf_size: int) -> _List[bytes]:
+    view = memoryview(data)
+    return [hash_leaf(view[i:i + leaf_size], cls) for i in range(0, max(len(view), 1), leaf_size)]
+
+
+def leaf_digests(source: _Input, algorithm: _Union[str, _Type[Hash]] = 'sha256', leaf_size: int = DEFAULT_LEAF_SIZE,
+                 workers: _Optional[int] = None) -> _List[bytes]:
+    """
+    Hashes every leaf of a file or a bytes-like object.
+
+    :param source: The path of a file or a bytes-like object.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param leaf_size: The size of a leaf in bytes.
+    :param workers: The number of processes hashing the leaves, the number of CPUs by default.
+    :return: The leaf digests in order.
+    """
+    cls = get_algorithm(algorithm)
+    if leaf_size < 1:
+        raise ValueError("leaf_size must be at least 1")
+    if workers is None:
+        workers = _os.cpu_count() or 1
+
+    if isinstance(source, (str, _os.PathLike)):
+        n_leaves = max(-(-_os.path.getsize(source) // leaf_size), 1)
+        if workers <= 1 or n_leaves == 1:
+            return _hash_file_leaves(source, cls, leaf_size, 0, n_leaves)
+        # A few tasks per worker, so a slow task does not keep the others waiting
+        per_task = max(-(-n_leaves // (workers * 4)), 1)
+        firsts = range(0, n_leaves, per_task)
+        counts = [min(per_task, n_leaves - first) for first in firsts]
+        with _ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_hash_file_leaves, [source] * len(firsts), [cls] * len(firsts),
+                                   [leaf_size] * len(firsts), firsts, counts)
+            return [digest for result in results for digest in result]
+
+    data = Hash._as_view(source)
+    if workers <= 1 or len(data) <= leaf_size:
+        return _hash_data_leaves(data, cls, leaf_size)
+    per_task = max(-(-len(data) // leaf_size // (workers * 4)), 1) * leaf_size
+    parts = [data[i:i + per_task].tobytes() for i in range(0, len(data), per_task)]
+    with _ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_hash_data_leaves, parts, [cls] * len(parts), [leaf_size] * len(parts))
+        return [digest for result in results for digest in result]
+
+
+def tree_hash(source: _Input, algorithm: _Union[str, _Type[Hash]] = 'sha256', leaf_size: int = DEFAULT_LEAF_SIZE,
+              workers: _Optional[int] = None) -> bytes:
+    """
+    Hashes a file or a bytes-like object as a tree, hashing the leaves on several CPU cores. See the format at the top
+    of this module.
+
+    :param source: The path of a file or a bytes-like object.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param leaf_size: The size of a leaf in bytes.
+    :param workers: The number of processes hashing the leaves, the number of CPUs by default.
+    :return: The root digest.
+    """
+    return tree_root(leaf_digests(source, algorithm, leaf_size, workers), algorithm)
@@ -0,0 +1,209 @@
+# cryptwentyone.Hash.Work.py
+# CodeWriter21
+
+# Hashcash-style proof of work: find a nonce so that H(header || nonce) starts with `difficulty` zero bits, where the
+# nonce is encoded in `nonce_size` bytes in the word byte order of the algorithm(big-endian, little-endian for MD5).
+
+import os as _os
+import struct as _struct
+import functools as _functools
+import multiprocessing as _multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor, wait as _wait, \
+    FIRST_COMPLETED as _FIRST_COMPLETED
+from typing import Union as _Union, Type as _Type, Optional as _Optional, Callable as _Callable, List as _List, \
+    Dict as _Dict, Tuple as _Tuple
+
+from .Hash import Hash, get_algorithm
+from .Kernels import nonce_kernel
+from .Midstate import MidstateCache, with_prefix
+
+__all__ = ['solve_nonce', 'verify_nonce', 'leading_zero_bits', 'nonce_bytes']
+
+# The nonces are searched in chunks of this size, the first chunk in the calling process.
+CHUNK_SIZE = 1 << 16
+# The workers check whether another worker has already won every this many nonces.
+CHECK_INTERVAL = 1 << 12
+
+# Set in the workers when any of them finds a nonce.
+_stop_event = None
+
+
+def leading_zero_bits(digest: bytes) -> int:
+    """
+    Counts the leading zero bits of a digest.
+
+    :param digest: The digest.
+    :return: The number of leading zero bits.
+    """
+    return len(digest) * 8 - int.from_bytes(digest, 'big').bit_length()
+
+
+def nonce_bytes(nonce: int, nonce_size: int = 8, algorithm: _Union[str, _Type[Hash]] = 'sha256') -> bytes:
+    """
+    Encodes a nonce the way it is appended to the header.
+
+    :param nonce: The nonce.
+    :param nonce_size: The size of the nonce in bytes.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :return: The encoded nonce.
+    """
+    return nonce.to_bytes(nonce_size, get_algorithm(algorithm).length_byteorder)
+
+
+def verify_nonce(header: _Union[str, bytes], nonce: int, difficulty: int,
+                 algorithm: _Union[str, _Type[Hash]] = 'sha256', nonce_size: int = 8,
+                 cache: _Optional[MidstateCache] = None) -> bool:
+    """
+    Checks a proof of work. The state after the header comes from a midstate cache, so checking several nonces of the
+    same header costs only the last block(s) each.
+
+    :param header: The constant part of the message.
+    :param nonce: The nonce to check.
+    :param difficulty: The required number of leading zero bits.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param nonce_size: The size of the nonce in bytes.
+    :param cache: The midstate cache to use, `default_cache` by default.
+    :return: True if the digest has at least `difficulty` leading zero bits.
+    """
+    if not 0 <= nonce < 1 << (8 * nonce_size):
+        return False
+    digest = with_prefix(algorithm, header, nonce_bytes(nonce, nonce_size, algorithm), cache).digest()
+    return leading_zero_bits(digest) >= difficulty
+
+
+@_functools.lru_cache(maxsize=16)
+def _searcher(cls: _Type[Hash], header: bytes, difficulty: int, nonce_size: int) -> _Callable:
+    """
+    Builds the search function of a proof of work: search(start, stop) returns the first nonce in range(start, stop)
+    that meets the difficulty, or None.
+    """
+    midstate = cls(header)
+    if cls._compress is None:
+        return _functools.partial(_search_generic, midstate, difficulty, nonce_size)
+
+    rounds = cls._compress.rounds
+    word_size = _struct.calcsize(rounds.word_format[-1])
+    state = midstate._get_state()
+    # The last block(s): the rest of the header, zeros in place of the nonce and the padding
+    offset = len(midstate._buffer)
+    tail = midstate._buffer + b'\x00' * nonce_size + cls._padding(len(header) + nonce_size)
+    blocks = [_struct.unpack_from(rounds.word_format, tail, start) for start in range(0, len(tail), cls.block_size)]
+
+    nonce_words: _List[_Dict[int, _Tuple[int, int, int]]] = []
+    for index in range(len(blocks)):
+        words = {}
+        for i in range(16):
+            start = index * cls.block_size + i * word_size
+            low, high = max(offset, start), min(offset + nonce_size, start + word_size)
+            if low >= high:
+                continue
+            count = high - low
+            if cls.length_byteorder == 'big':
+                words[i] = (8 * (offset + nonce_size - high), (1 << (8 * count)) - 1, 8 * (start + word_size - high))
+            else:
+                words[i] = (8 * (low - offset), (1 << (8 * count)) - 1, 8 * (low - start))
+        nonce_words.append(words)
+
+    check_words = max(1, -(-difficulty // (word_size * 8)))
+    limit = 1 << (check_words * word_size * 8 - difficulty)
+    return nonce_kernel(rounds, state, blocks, nonce_words, check_words, limit)
+
+
+def _search_generic(midstate: Hash, difficulty: int, nonce_size: int, start: int, stop: int) -> _Optional[int]:
+    for nonce in range(start, stop):
+        hasher = midstate.copy()
+        hasher.update(nonce.to_bytes(nonce_size, hasher.length_byteorder))
+        if leading_zero_bits(hasher.digest()) >= difficulty:
+            return nonce
+    return None
+
+
+def _initialize_worker(event) -> None:
+    global _stop_event
+    _stop_event = event
+
+
+def _search_chunk(cls: _Type[Hash], header: bytes, difficulty: int, nonce_size: int, start: int,
+                  stop: int) -> _Optional[int]:
+    """
+    Searches a chunk of the nonce space in a worker, giving up as soon as another worker has won.
+    """
+    search = _searcher(cls, header, difficulty, nonce_size)
+    for low in range(start, stop, CHECK_INTERVAL):
+        if _stop_event is not None and _stop_event.is_set():
+            return None
+        nonce = search(low, min(low + CHECK_INTERVAL, stop))
+        if nonce is not None:
+            if _stop_event is not None:
+                _stop_event.set()
+            return nonce
+    return None
+
+
+def solve_nonce(header: _Union[str, bytes], difficulty: int, algorithm: _Union[str, _Type[Hash]] = 'sha256',
+                nonce_size: int = 8, start: int = 0, stop: _Optional[int] = None,
+                workers: _Optional[int] = None) -> _Optional[int]:
+    """
+    Searches for a nonce so that H(header || nonce) has at least `difficulty` leading zero bits.
+
+    The header is compressed once and every attempt only runs the last block(s), with the parts that do not depend on
+    the nonce computed in advance. The first chunk of nonces is searched in this process, the rest is split across a
+    pool of processes which stop as soon as one of them finds a nonce.
+
+    :param header: The constant part of the message.
+    :param difficulty: The required number of leading zero bits.
+    :param algorithm: The name of the algorithm(e.g. 'sha256') or a Hash subclass.
+    :param nonce_size: The size of the nonce in bytes.
+    :param start: The first nonce to try.
+    :param stop: The end of the searched nonces(exclusive), every nonce that fits in `nonce_size` bytes by default.
+    :param workers: The number of processes, the number of CPUs by default. 1 searches in this process only.
+    :return: A nonce, the lowest one when a single process searches; None if no nonce in the range meets the
+        difficulty.
+    """
+    cls = get_algorithm(algorithm)
+    header = Hash._as_view(header).tobytes()
+    if not 0 <= difficulty <= cls.digest_size * 8:
+        raise ValueError(f"difficulty must be between 0 and {cls.digest_size * 8}")
+    if nonce_size < 1:
+        raise ValueError("nonce_size must be at least 1")
+    end = 1 << (8 * nonce_size)
+    stop = end if stop is None else min(stop, end)
+    if workers is None:
+        workers = _os.cpu_count() or 1
+
+    arguments = (cls, header, difficulty, nonce_size)
+    first = min(stop, start + CHUNK_SIZE)
+    nonce = _searcher(*arguments)(start, first) if start < first else None
+    if nonce is not None or first >= stop:
+        return nonce
+    if workers <= 1:
+        return _searcher(*arguments)(first, stop)
+
+    event = _multiprocessing.Event()
+    chunks = iter(range(first, stop, CHUNK_SIZE))
+    found = None
+    with _ProcessPoolExecutor(max_workers=workers, initializer=_initialize_worker, initargs=(event,)) as executor:
+        pending = set()
+        for low in chunks:
+            pending.add(executor.submit(_search_chunk, *arguments, low, min(low + CHUNK_SIZE, stop)))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            done, pending = _wait(pending, return_when=_FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                nonce = future.result()
+                if nonce is not None and (found is None or nonce < found):
+                    found = nonce
+            if found is not None:
+                event.set()
+                for future in pending:
+                    future.cancel()
+                continue
+            for _ in done:
+                low = next(chunks, None)
+                if low is not None:
+                    pending.add(executor.submit(_search_chunk, *arguments, low, min(low + CHUNK_SIZE, stop)))
+    return found
@@ -1,3 +1,20 @@
 from .MD5 import MD5Python
 from .SHA1 import SHA1Python
-from .SHA2 import SHA256Python, SHA224Python, SHA512Python, SHA384Python
+from .SHA2 import SHA256Python, SHA224Python, SHA512Python, SHA384Python, SHA512_224Python, SHA512_256Python
+from .Hash import Hash, get_algorithm
+from .Backends import new, register_backend, available_backends, calibrate
+from .File import hash_file, hash_files
+from .Cache import DigestCache
+from .Multi import MultiHash
+from .Batch import hash_many
+from .Parallel import gil_enabled
+from .Midstate import MidstateCache, with_prefix
+from .HMAC import HMAC
+from .PBKDF2 import pbkdf2_hmac
+from .Work import solve_nonce, verify_nonce
+from .Tree import tree_hash, leaf_digests, tree_root
+from .Fixed import sha256_32, sha256_64, sha256d, merkle_root
+from .Manifest import hash_tree, write_manifest
+from .Chunking import chunk_stream, chunk_file
+from .Async import ahash
+from .Instrumentation import Instrumentation
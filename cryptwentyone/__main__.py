@@ -0,0 +1,221 @@
+# cryptwentyone.__main__.py
+# CodeWriter21
+
+# md5sum/sha*sum compatible command line interface.
+#
+#   python -m cryptwentyone -a sha256 file1 file2          # Prints `<hexdigest>  <path>` lines
+#   cat file | python -m cryptwentyone -a md5              # Hashes the standard input('-') in constant memory
+#   python -m cryptwentyone -a sha256 -j 8 *.iso > SUMS    # Hashes the files on 8 processes, in order
+#   python -m cryptwentyone -a sha256 --check SUMS         # Verifies a manifest(GNU or BSD `--tag` format)
+
+import os as _os
+import re as _re
+import sys as _sys
+import time as _time
+import argparse as _argparse
+
+from concurrent.futures import ProcessPoolExecutor as _ProcessPoolExecutor
+from typing import List as _List, Iterator as _Iterator, Iterable as _Iterable, Optional as _Optional, \
+    Tuple as _Tuple, NamedTuple as _NamedTuple, TextIO as _TextIO
+
+from cryptwentyone.Hash import get_algorithm, hash_file
+from cryptwentyone.Hash.Hash import _algorithms
+from cryptwentyone.Hash.Manifest import _escape_path, _unescape_path
+
+__all__ = ['main']
+
+# <hexdigest>  <path>, or <hexdigest> *<path> in binary mode
+_GNU_LINE = _re.compile(r'^(\\?)([0-9a-fA-F]+) [ *](.*)$')
+# NAME (<path>) = <hexdigest>
+_BSD_LINE = _re.compile(r'^(\\?)([A-Za-z0-9_/-]+) \((.*)\) = ([0-9a-fA-F]+)$')
+
+
+class _Result(_NamedTuple):
+    path: str
+    hexdigest: _Optional[str]
+    size: int
+    seconds: float
+    error: _Optional[str] = None
+
+
+def _hash_path(path: str, algorithm: str) -> _Result:
+    """
+    Hashes a file, or the standard input if the path is '-'.
+    """
+    start = _time.perf_counter()
+    try:
+        if path == '-':
+            hasher = get_algorithm(algorithm)()
+            hasher.update_file(_sys.stdin.buffer)
+        else:
+            hasher = hash_file(path, algorithm)
+    except OSError as e:
+        return _Result(path, None, 0, _time.perf_counter() - start, e.strerror or str(e))
+    return _Result(path, hasher.hexdigest(), hasher._length, _time.perf_counter() - start)
+
+
+def _hash_paths(paths: _List[str], algorithm: str, jobs: int) -> _Iterator[_Result]:
+    """
+    Hashes the files in order, on a pool of processes if jobs is more than 1. The standard input is always read by
+    this process.
+    """
+    files = [path for path in paths if path != '-']
+    if jobs <= 1 or len(files) <= 1:
+        for path in paths:
+            yield _hash_path(path, algorithm)
+        return
+
+    with _ProcessPoolExecutor(max_workers=min(jobs, len(files))) as executor:
+        results = executor.map(_hash_path, files, [algorithm] * len(files))
+        for path in paths:
+            yield _hash_path(path, algorithm) if path == '-' else next(results)
+
+
+def _print_stats(result: _Result, stats: _TextIO) -> None:
+    speed = result.size / result.seconds / 1e6 if result.seconds > 0 else 0.0
+    print(f'{result.path}: {result.size} bytes in {result.seconds:.3f} s ({speed:.3f} MB/s)', file=stats)
+
+
+def _parse_manifest(lines: _Iterable[str], algorithm: str) -> _Iterator[_Tuple[int, _Optional[_Tuple[str, str]]]]:
+    """
+    Parses the lines of a manifest.
+
+    :return: The line numbers and the (path, expected hexdigest) pairs, or None for the malformed lines.
+    """
+    cls = get_algorithm(algorithm)
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        match = _GNU_LINE.match(line)
+        if match is not None:
+            escaped, digest, path = match.groups()
+        else:
+            match = _BSD_LINE.match(line)
+            if match is None or match.group(2).lower() != cls.name:
+                yield number, None
+                continue
+            escaped, _, path, digest = match.groups()
+        if len(digest) != cls.digest_size * 2:
+            yield number, None
+            continue
+        yield number, (_unescape_path(path) if escaped else path, digest.lower())
+
+
+def _check(manifests: _List[str], args: _argparse.Namespace) -> int:
+    """
+    Verifies the files listed in the manifests. Like sha256sum, a manifest without any properly formatted line, or
+    whose every file is skipped by --ignore-missing, is a failure.
+
+    :return: The exit code.
+    """
+    code = 0
+    for manifest in manifests:
+        try:
+            if manifest == '-':
+                lines = list(_sys.stdin)
+            else:
+                with open(manifest, encoding='utf-8', errors='surrogateescape') as file:
+                    lines = list(file)
+        except OSError as e:
+            print(f'{manifest}: {e.strerror or e}', file=_sys.stderr)
+            code = 1
+            continue
+
+        entries = []
+        formatted = malformed = 0
+        for number, entry in _parse_manifest(lines, args.algorithm):
+            if entry is None:
+                malformed += 1
+                if args.warn:
+                    print(f'{manifest}: {number}: improperly formatted {args.algorithm} checksum line',
+                          file=_sys.stderr)
+                continue
+            formatted += 1
+            if args.ignore_missing and not _os.path.exists(entry[0]):
+                continue
+            entries.append(entry)
+        if not formatted:
+            print(f'{manifest}: no properly formatted checksum lines found', file=_sys.stderr)
+            code = 1
+            continue
+
+        failed = unreadable = verified = 0
+        results = _hash_paths([path for path, _ in entries], args.algorithm, args.jobs)
+        for (_, expected), result in zip(entries, results):
+            if args.stats and result.error is None:
+                _print_stats(result, _sys.stderr)
+            prefix, path = _escape_path(result.path)
+            if result.error is not None:
+                unreadable += 1
+                if not args.status:
+                    print(f'{prefix}{path}: {result.error}', file=_sys.stderr)
+                    print(f'{prefix}{path}: FAILED open or read')
+                continue
+            verified += 1
+            if result.hexdigest != expected:
+                failed += 1
+                if not args.status:
+                    print(f'{prefix}{path}: FAILED')
+            elif not args.quiet and not args.status:
+                print(f'{prefix}{path}: OK')
+
+        if not args.status:
+            if malformed:
+                print(f'WARNING: {malformed} line{"s are" if malformed > 1 else " is"} improperly formatted',
+                      file=_sys.stderr)
+            if unreadable:
+                print(f'WARNING: {unreadable} listed file{"s" if unreadable > 1 else ""} could not be read',
+                      file=_sys.stderr)
+            if failed:
+                print(f'WARNING: {failed} computed checksum{"s" if failed > 1 else ""} did NOT match',
+                      file=_sys.stderr)
+        if args.ignore_missing and not verified:
+            print(f'{manifest}: no file was verified', file=_sys.stderr)
+            code = 1
+        if failed or unreadable or (args.strict and malformed):
+            code = 1
+    return code
+
+
+def main(argv: _List[str] = None) -> int:
+    parser = _argparse.ArgumentParser(prog='python -m cryptwentyone',
+                                      description='Prints or checks checksums, like md5sum and sha256sum.')
+    parser.add_argument('files', nargs='*', default=['-'], metavar='FILE',
+                        help="The files to hash(or the manifests to check with --check), '-' is the standard input")
+    parser.add_argument('-a', '--algorithm', default='sha256', type=str.lower, choices=sorted(_algorithms),
+                        help='The hash algorithm(default: sha256)')
+    parser.add_argument('-c', '--check', action='store_true', help='Reads checksums from the FILEs and checks them')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='Hashes the files on this many processes')
+    parser.add_argument('--tag', action='store_true', help='Prints BSD-style checksums')
+    parser.add_argument('--stats', action='store_true', help='Prints the size, time and throughput of every file to '
+                                                             'the standard error')
+    check = parser.add_argument_group('--check options')
+    check.add_argument('--ignore-missing', action='store_true', help="Doesn't fail or report the missing files")
+    check.add_argument('--quiet', action='store_true', help="Doesn't print OK for every successfully verified file")
+    check.add_argument('--status', action='store_true', help="Doesn't print anything, the exit code shows success")
+    check.add_argument('--strict', action='store_true', help='Exits non-zero for improperly formatted lines')
+    check.add_argument('-w', '--warn', action='store_true', help='Warns about improperly formatted lines')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+
+    if args.check:
+        return _check(args.files, args)
+
+    failed = 0
+    for result in _hash_paths(args.files, args.algorithm, args.jobs):
+        if result.error is not None:
+            failed += 1
+            print(f'{parser.prog}: {result.path}: {result.error}', file=_sys.stderr)
+            continue
+        prefix, path = _escape_path(result.path)
+        if args.tag:
+            print(f'{prefix}{args.algorithm.upper()} ({path}) = {result.hexdigest}')
+        else:
+            print(f'{prefix}{result.hexdigest}  {path}')
+        if args.stats:
+            _print_stats(result, _sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    _sys.exit(main())
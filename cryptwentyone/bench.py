@@ -0,0 +1,252 @@
+# cryptwentyone.bench.py
+# CodeWriter21
+
+# Throughput benchmark of the hash algorithms.
+#
+#   python -m cryptwentyone.bench                                  # Prints the throughput matrix
+#   python -m cryptwentyone.bench --output results.json            # Also saves the results
+#   python -m cryptwentyone.bench --baseline baseline.json         # Fails if anything got slower than the baseline
+#   python -m cryptwentyone.bench --apis batch --workers 1 2 4 8   # Shows how the batch API scales with the workers
+
+import os as _os
+import sys as _sys
+import json as _json
+import time as _time
+import hashlib as _hashlib
+import argparse as _argparse
+import platform as _platform
+
+try:
+    import resource as _resource
+except ImportError:
+    _resource = None
+
+from typing import List as _List, Dict as _Dict, Callable as _Callable, Optional as _Optional, Any as _Any
+
+import cryptwentyone as _cryptwentyone
+
+from cryptwentyone.Hash import get_algorithm, hash_many, gil_enabled
+
+__all__ = ['run', 'compare', 'main']
+
+ALGORITHMS = ['md5', 'sha1', 'sha224', 'sha256', 'sha384', 'sha512', 'sha512_224', 'sha512_256']
+SIZES = [0, 64, 1 << 10, 64 << 10, 1 << 20, 16 << 20, 64 << 20]
+APIS = ['oneshot', 'streaming', 'batch']
+# The size of the chunks fed to update() by the streaming API.
+STREAM_CHUNK_SIZE = 64 << 10
+# The batch API hashes this many messages of the given size(sizes above BATCH_MAX_SIZE are skipped).
+BATCH_COUNT = 256
+BATCH_MAX_SIZE = 64 << 10
+
+
+def _oneshot(cls, data: bytes, workers: int) -> _Callable[[], _Any]:
+    return lambda: cls(data).digest()
+
+
+def _streaming(cls, data: bytes, workers: int) -> _Callable[[], _Any]:
+    view = memoryview(data)
+
+    def function():
+        hasher = cls()
+        for i in range(0, len(view), STREAM_CHUNK_SIZE):
+            hasher.update(view[i:i + STREAM_CHUNK_SIZE])
+        return hasher.digest()
+
+    return function
+
+
+def _batch(cls, data: bytes, workers: int) -> _Callable[[], _Any]:
+    messages = [data] * BATCH_COUNT
+    return lambda: hash_many(messages, cls, workers=workers)
+
+
+_API_FUNCTIONS = {'oneshot': _oneshot, 'streaming': _streaming, 'batch': _batch}
+
+
+def _measure(function: _Callable[[], _Any], min_time: float) -> float:
+    """
+    Runs a function repeatedly for at least min_time seconds(and at least once).
+
+    :return: The best time of a single run in seconds.
+    """
+    best = float('inf')
+    start = _time.perf_counter()
+    while True:
+        t = _time.perf_counter()
+        function()
+        best = min(best, _time.perf_counter() - t)
+        if _time.perf_counter() - start >= min_time:
+            return best
+
+
+def _peak_memory(function: _Callable[[], _Any]) -> _Optional[int]:
+    """
+    Returns how much one run of a function raised the peak resident memory, in bytes. The function runs in a forked
+    child process, so every case starts from the same high-water mark.
+
+    :return: The peak memory growth, or None where fork or the resource module is not available.
+    """
+    if _resource is None or not hasattr(_os, 'fork'):
+        return None
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    unit = 1 if _sys.platform == 'darwin' else 1024
+    read_end, write_end = _os.pipe()
+    pid = _os.fork()
+    if pid == 0:
+        try:
+            _os.close(read_end)
+            start = _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss
+            function()
+            peak = _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss
+            _os.write(write_end, str((peak - start) * unit).encode())
+        finally:
+            _os._exit(0)
+    _os.close(write_end)
+    with open(read_end, 'rb') as pipe:
+        output = pipe.read()
+    _os.waitpid(pid, 0)
+    return int(output) if output else None
+
+
+def run(algorithms: _List[str] = None, sizes: _List[int] = None, apis: _List[str] = None, min_time: float = 0.2,
+        memory: bool = True, log: _Optional[_Callable[[str], None]] = None,
+        workers: _List[int] = None) -> _Dict[str, _Any]:
+    """
+    Runs the benchmark matrix.
+
+    :param algorithms: The names of the algorithms.
+    :param sizes: The input sizes in bytes.
+    :param apis: The APIs to measure: 'oneshot', 'streaming' and/or 'batch'.
+    :param min_time: The minimum time spent measuring each case in seconds.
+    :param memory: Measures the peak memory growth of every case(one extra run in a forked process).
+    :param log: Called with a line of text after every case.
+    :param workers: The numbers of workers the batch API is measured with(threads on free-threaded Python builds,
+        processes otherwise), [1] by default.
+    :return: The results: {'environment': {...}, 'results': [{...}, ...]}.
+    """
+    algorithms = algorithms or ALGORITHMS
+    sizes = SIZES[:5] if sizes is None else sizes
+    apis = apis or APIS
+    workers = workers or [1]
+    results = []
+    for name in algorithms:
+        cls = get_algorithm(name)
+        for size in sizes:
+            data = _os.urandom(size)
+            for api, n_workers in [(api, n) for api in apis for n in (workers if api == 'batch' else [1])]:
+                if api == 'batch' and size > BATCH_MAX_SIZE:
+                    continue
+                count = BATCH_COUNT if api == 'batch' else 1
+                total = size * count
+                blocks = ((size + cls.length_size) // cls.block_size + 1) * count
+                function = _API_FUNCTIONS[api](cls, data, n_workers)
+                seconds = _measure(function, min_time)
+
+                reference = None
+                if name in _hashlib.algorithms_available:
+                    reference = _measure(lambda: [_hashlib.new(name, data).digest() for _ in range(count)], min_time)
+                result = {
+                    'algorithm': name,
+                    'api': api,
+                    'workers': n_workers,
+                    'size': size,
+                    'mb_per_s': total / seconds / 1e6 if total else 0.0,
+                    'ns_per_block': seconds / blocks * 1e9,
+                    'peak_memory': _peak_memory(function) if memory else None,
+                    'hashlib_mb_per_s': None if reference is None else total / reference / 1e6 if total else 0.0,
+                }
+                results.append(result)
+                if log is not None:
+                    log(_format(result))
+    return {
+        'environment': {
+            'version': _cryptwentyone.__version__,
+            'python': _platform.python_version(),
+            'implementation': _platform.python_implementation(),
+            'machine': _platform.machine(),
+            'cpus': _os.cpu_count(),
+            'gil_enabled': gil_enabled(),
+        },
+        'results': results,
+    }
+
+
+def _api_label(result: _Dict[str, _Any]) -> str:
+    return result['api'] if result.get('workers', 1) == 1 else f"{result['api']} x{result['workers']}"
+
+
+def _format(result: _Dict[str, _Any]) -> str:
+    memory = '-' if result['peak_memory'] is None else f"{result['peak_memory'] / 1024:.1f} KiB"
+    reference = '-' if result['hashlib_mb_per_s'] is None else f"{result['hashlib_mb_per_s']:.1f} MB/s"
+    return f"{result['algorithm']:<8} {_api_label(result):<10} {result['size']:>10} B  " \
+           f"{result['mb_per_s']:>9.3f} MB/s  {result['ns_per_block']:>12.0f} ns/block  {memory:>12}  " \
+           f"hashlib {reference:>12}"
+
+
+def compare(results: _Dict[str, _Any], baseline: _Dict[str, _Any], tolerance: float = 0.1) -> _List[str]:
+    """
+    Compares the time per block of the results with a baseline.
+
+    :param results: The results of `run`.
+    :param baseline: The results of a previous `run`.
+    :param tolerance: The allowed slowdown(0.1 = 10%).
+    :return: A description of every case that got slower than the tolerance.
+    """
+    def key(result: _Dict[str, _Any]) -> tuple:
+        # The results saved before the workers were measured are single-worker ones
+        return result['algorithm'], result['api'], result.get('workers', 1), result['size']
+
+    expected = {key(r): r for r in baseline['results']}
+    regressions = []
+    for result in results['results']:
+        old = expected.get(key(result))
+        if old is None:
+            continue
+        if result['ns_per_block'] > old['ns_per_block'] * (1 + tolerance):
+            regressions.append(f"{result['algorithm']} {_api_label(result)} {result['size']} B: "
+                               f"{old['ns_per_block']:.0f} -> {result['ns_per_block']:.0f} ns/block "
+                               f"({(result['ns_per_block'] / old['ns_per_block'] - 1) * 100:+.1f}%)")
+    return regressions
+
+
+def main(argv: _List[str] = None) -> int:
+    parser = _argparse.ArgumentParser(prog='python -m cryptwentyone.bench',
+                                      description='Measures the throughput of the hash algorithms.')
+    parser.add_argument('-a', '--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS)
+    parser.add_argument('-s', '--sizes', nargs='+', type=int, help='Input sizes in bytes')
+    parser.add_argument('--max-size', type=int, default=1 << 20,
+                        help='Skips the default sizes above this(default: 1 MiB, 67108864 runs the full 64 MiB sweep)')
+    parser.add_argument('--apis', nargs='+', default=APIS, choices=APIS)
+    parser.add_argument('--min-time', type=float, default=0.2, help='Minimum seconds spent measuring each case')
+    parser.add_argument('--no-memory', action='store_true', help='Skips the peak memory measurements')
+    parser.add_argument('-w', '--workers', nargs='+', type=int, default=[1],
+                        help='Measures the batch API with these numbers of workers(threads on free-threaded Python '
+                             'builds, processes otherwise)')
+    parser.add_argument('-o', '--output', help='Writes the results to this JSON file')
+    parser.add_argument('-b', '--baseline', help='Compares the results with this JSON file')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.1,
+                        help='Allowed slowdown compared to the baseline(default: 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes if args.sizes is not None else [size for size in SIZES if size <= args.max_size]
+    results = run(args.algorithms, sizes, args.apis, args.min_time, not args.no_memory, log=print, workers=args.workers)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            _json.dump(results, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = _json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f'{len(regressions)} regression(s) compared to {args.baseline}:', file=_sys.stderr)
+            for regression in regressions:
+                print('  ' + regression, file=_sys.stderr)
+            return 1
+        print(f'No regressions compared to {args.baseline}.')
+    return 0
+
+
+if __name__ == '__main__':
+    _sys.exit(main())
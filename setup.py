@@ -15,6 +15,12 @@ setup(
     author_email='CodeWriter21@gmail.com',
     url='https://github.com/MPCodeWriter21/cryptwentyone',
     packages=find_packages(),
+    extras_require={
+        'numpy': ['numpy'],
+    },
+    entry_points={
+        'console_scripts': ['cryptwentyone=cryptwentyone.__main__:main'],
+    },
     license='Apache License, Version 2.0',
     classifiers=[
         'Intended Audience :: Developers',
@@ -0,0 +1,80 @@
+# tests.test_cli.py
+# CodeWriter21
+
+import hashlib as _hashlib
+
+import pytest
+
+from cryptwentyone.__main__ import main
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'a').write_bytes(b'a')
+    (tmp_path / 'new\nline').write_bytes(b'b')
+    return tmp_path
+
+
+def _line(data: bytes, path: str) -> str:
+    return f'{_hashlib.sha256(data).hexdigest()}  {path}\n'
+
+
+def test_hash_and_check(files, capsys):
+    assert main(['a', 'new\nline']) == 0
+    output = capsys.readouterr().out
+    assert output == _line(b'a', 'a') + '\\' + _line(b'b', 'new\\nline')
+
+    (files / 'SUMS').write_text(output)
+    assert main(['-c', 'SUMS']) == 0
+    assert capsys.readouterr().out == 'a: OK\n\\new\\nline: OK\n'
+
+
+def test_check_mismatch(files, capsys):
+    (files / 'SUMS').write_text(_line(b'x', 'a') + '\\' + _line(b'x', 'new\\nline'))
+    assert main(['-c', 'SUMS']) == 1
+    captured = capsys.readouterr()
+    assert captured.out == 'a: FAILED\n\\new\\nline: FAILED\n'
+    assert 'WARNING: 2 computed checksums did NOT match' in captured.err
+
+
+def test_check_unreadable(files, capsys):
+    (files / 'SUMS').write_text('\\' + _line(b'a', 'missing\\nfile'))
+    assert main(['-c', 'SUMS']) == 1
+    captured = capsys.readouterr()
+    assert captured.out == '\\missing\\nfile: FAILED open or read\n'
+    assert 'WARNING: 1 listed file could not be read' in captured.err
+
+
+@pytest.mark.parametrize('content', ['', 'garbage\n', f'{"0" * 32}  a\n'])
+def test_check_without_formatted_lines(files, capsys, content):
+    (files / 'SUMS').write_text(content)
+    assert main(['-c', 'SUMS']) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err == 'SUMS: no properly formatted checksum lines found\n'
+
+
+def test_check_malformed_lines(files, capsys):
+    (files / 'SUMS').write_text('garbage\n' + _line(b'a', 'a'))
+    assert main(['-c', 'SUMS']) == 0
+    assert 'WARNING: 1 line is improperly formatted' in capsys.readouterr().err
+    assert main(['-c', '--strict', 'SUMS']) == 1
+
+
+def test_check_ignore_missing(files, capsys):
+    (files / 'SUMS').write_text(_line(b'a', 'missing') + _line(b'a', 'a'))
+    assert main(['-c', '--ignore-missing', 'SUMS']) == 0
+    assert capsys.readouterr().out == 'a: OK\n'
+
+    (files / 'SUMS').write_text(_line(b'a', 'missing'))
+    assert main(['-c', '--ignore-missing', 'SUMS']) == 1
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert captured.err == 'SUMS: no file was verified\n'
+
+
+def test_check_status(files, capsys):
+    (files / 'SUMS').write_text(_line(b'x', 'a'))
+    assert main(['-c', '--status', 'SUMS']) == 1
+    assert capsys.readouterr() == ('', '')
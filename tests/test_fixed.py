@@ -0,0 +1,74 @@
+# tests.test_fixed.py
+# CodeWriter21
+
+import hashlib as _hashlib
+
+import pytest
+
+from cryptwentyone.Hash import Fixed, sha256_32, sha256_64, sha256d, merkle_root
+
+
+def _sha256(data: bytes) -> bytes:
+    return _hashlib.sha256(data).digest()
+
+
+def _merkle_root(leaves, double: bool) -> bytes:
+    hash_node = (lambda data: _sha256(_sha256(data))) if double else _sha256
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [hash_node(level[i] + level[i + 1]) for i in range(0, len(level), 2)]
+    return level[0]
+
+
+MESSAGES = [bytes((i * 13 + j) % 256 for j in range(i)) for i in range(200)]
+
+
+def test_sha256_32_and_64():
+    for i in range(64):
+        data = bytes((i + j) % 256 for j in range(64))
+        assert sha256_32(data[:32]) == _sha256(data[:32])
+        assert sha256_64(data) == _sha256(data)
+    with pytest.raises(ValueError):
+        sha256_32(bytes(31))
+    with pytest.raises(ValueError):
+        sha256_64(bytes(65))
+
+
+def test_sha256d():
+    for message in MESSAGES:
+        assert sha256d(message) == _sha256(_sha256(message))
+    assert sha256d('abc') == _sha256(_sha256(b'abc'))
+
+
+def test_merkle_root_known_answer():
+    # Bitcoin block 100000: four transactions, the ids in the internal byte order
+    txids = [bytes.fromhex(txid)[::-1] for txid in [
+        '8c14f0db3df150123e6f3dbbf30f8b955a8249b62ac1d1ff16284aefa3d06d87',
+        'fff2525b8931402dd09222c50775608f75787bd2b87e56995a7bdd30f79702c4',
+        '6359f0868171b1d194cbee1af2f16ea598ae8fad666d9b012c8ed2b79a236ec4',
+        'e9a66845e05d5abc0ad04ec80f774a7e585c6e8db975962d069a522137b80c1d',
+    ]]
+    assert merkle_root(txids)[::-1].hex() == 'f3e94742aca4b5ef85488dc37c06c3282295ffec960994b2c0d5ac2a25a95766'
+
+
+@pytest.mark.parametrize('double', [True, False])
+@pytest.mark.parametrize('count', [1, 2, 3, 5, 8, 63, 64, 65, 100, 129])
+def test_merkle_root(double, count):
+    leaves = [_sha256(i.to_bytes(4, 'big')) for i in range(count)]
+    assert merkle_root(leaves, double) == _merkle_root(leaves, double)
+
+
+@pytest.mark.parametrize('double', [True, False])
+def test_merkle_root_without_numpy(monkeypatch, double):
+    leaves = [_sha256(i.to_bytes(4, 'big')) for i in range(100)]
+    monkeypatch.setattr(Fixed, '_np', None)
+    assert merkle_root(leaves, double) == _merkle_root(leaves, double)
+
+
+def test_merkle_root_errors():
+    with pytest.raises(ValueError):
+        merkle_root([])
+    with pytest.raises(ValueError):
+        merkle_root([bytes(31)])
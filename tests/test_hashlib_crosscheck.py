@@ -0,0 +1,81 @@
+# tests.test_hashlib_crosscheck.py
+# CodeWriter21
+
+# Checks every registered algorithm against hashlib and hmac of the standard library.
+
+import hmac as _hmac
+import hashlib as _hashlib
+
+import pytest
+
+from cryptwentyone.Hash import HMAC, pbkdf2_hmac, hash_many
+from cryptwentyone.Hash.Hash import _algorithms, get_algorithm
+
+ALGORITHMS = sorted(_algorithms)
+# Lengths around the block and the length field boundaries of 64-byte and 128-byte blocks
+LENGTHS = [0, 1, 55, 56, 63, 64, 65, 111, 112, 127, 128, 129, 1000]
+# Every length up to three 128-byte blocks, so a batch mixes messages of different numbers of blocks
+BATCH = [bytes((i * 7 + j) % 256 for j in range(i)) for i in range(300)]
+
+
+def _reference(name: str):
+    return lambda data=b'': _hashlib.new(name, data)
+
+
+def _reference_pbkdf2(name: str, password: bytes, salt: bytes, iterations: int, dklen: int) -> bytes:
+    # hashlib.pbkdf2_hmac does not support every algorithm with every OpenSSL build(e.g. SHA512/224)
+    digestmod = _reference(name)
+    key = b''
+    block = 1
+    while len(key) < dklen:
+        u = _hmac.new(password, salt + block.to_bytes(4, 'big'), digestmod).digest()
+        result = int.from_bytes(u, 'big')
+        for _ in range(iterations - 1):
+            u = _hmac.new(password, u, digestmod).digest()
+            result ^= int.from_bytes(u, 'big')
+        key += result.to_bytes(len(u), 'big')
+        block += 1
+    return key[:dklen]
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('length', LENGTHS)
+def test_digest(name, length):
+    message = bytes(range(256)) * 4
+    message = message[:length]
+    assert get_algorithm(name)(message).digest() == _hashlib.new(name, message).digest()
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+def test_update_in_pieces(name):
+    message = bytes(range(256)) * 3
+    hash_object = get_algorithm(name)()
+    for i in range(0, len(message), 37):
+        hash_object.update(message[i:i + 37])
+    assert hash_object.hexdigest() == _hashlib.new(name, message).hexdigest()
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('key', [b'', b'key', b'k' * 200])
+def test_hmac(name, key):
+    message = b'The quick brown fox jumps over the lazy dog'
+    assert HMAC(key, message, name).digest() == _hmac.new(key, message, _reference(name)).digest()
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('iterations', [1, 2, 3, 100])
+@pytest.mark.parametrize('dklen', [None, 5, 70])
+def test_pbkdf2_hmac(name, iterations, dklen):
+    expected = _reference_pbkdf2(name, b'password', b'salt', iterations, dklen or get_algorithm(name).digest_size)
+    assert pbkdf2_hmac(name, b'password', b'salt', iterations, dklen) == expected
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('engine', ['python', 'numpy', 'swar'])
+@pytest.mark.parametrize('workers, executor', [(1, 'auto'), (2, 'thread'), (3, 'thread'), (2, 'process'),
+                                               (3, 'process')])
+def test_hash_many(name, engine, workers, executor):
+    if engine == 'numpy':
+        pytest.importorskip('numpy')
+    expected = [_hashlib.new(name, message).digest() for message in BATCH]
+    assert hash_many(BATCH, name, engine, workers, executor) == expected
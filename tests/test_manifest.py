@@ -0,0 +1,31 @@
+# tests.test_manifest.py
+# CodeWriter21
+
+import io as _io
+import hashlib as _hashlib
+
+from cryptwentyone.Hash import write_manifest
+from cryptwentyone.Hash.Manifest import _escape_path, _unescape_path
+
+
+def test_write_manifest_escapes_paths(tmp_path):
+    names = ['plain', 'new\nline', 'back\\slash', 'carriage\rreturn']
+    for name in names:
+        (tmp_path / name).write_bytes(name.encode())
+    file = _io.StringIO()
+    assert write_manifest(tmp_path, file, 'sha256', workers=1) == 0
+
+    lines = file.getvalue().splitlines()
+    assert len(lines) == len(names)
+    entries = {}
+    for line in lines:
+        escaped = line.startswith('\\')
+        digest, path = line[escaped:].split('  ', 1)
+        entries[_unescape_path(path) if escaped else path] = digest
+    assert entries == {name: _hashlib.sha256(name.encode()).hexdigest() for name in names}
+
+
+def test_escape_path():
+    assert _escape_path('plain') == ('', 'plain')
+    assert _escape_path('a\\b\nc\rd') == ('\\', 'a\\\\b\\nc\\rd')
+    assert _unescape_path(_escape_path('a\\n\nb')[1]) == 'a\\n\nb'
@@ -0,0 +1,56 @@
+# tests.test_state.py
+# CodeWriter21
+
+import hashlib as _hashlib
+
+import pytest
+
+from cryptwentyone.Hash import Hash, MD5Python, SHA256Python
+from cryptwentyone.Hash.Hash import _algorithms, get_algorithm
+
+ALGORITHMS = sorted(_algorithms)
+MESSAGE = bytes(range(256)) * 2
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('split', [0, 1, 63, 64, 65, 127, 128, 129, 300])
+@pytest.mark.parametrize('reference', [False, True])
+def test_round_trip(name, split, reference):
+    hasher = get_algorithm(name)(MESSAGE[:split])
+    restored = Hash.from_state(hasher.export_state(), reference=reference)
+    assert type(restored) is get_algorithm(name)
+    restored.update(MESSAGE[split:])
+    assert restored.digest() == _hashlib.new(name, MESSAGE).digest()
+    # The exported object is not changed
+    assert hasher.digest() == _hashlib.new(name, MESSAGE[:split]).digest()
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+def test_subclass_round_trip(name):
+    cls = get_algorithm(name)
+    restored = cls.from_state(cls(MESSAGE[:100]).export_state())
+    restored.update(MESSAGE[100:])
+    assert restored.hexdigest() == _hashlib.new(name, MESSAGE).hexdigest()
+
+
+def test_subclass_rejects_other_algorithm():
+    with pytest.raises(ValueError, match='md5'):
+        SHA256Python.from_state(MD5Python(b'abc').export_state())
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+def test_truncated_state(name):
+    state = get_algorithm(name)(MESSAGE[:70]).export_state()
+    for length in range(len(state)):
+        with pytest.raises(ValueError):
+            Hash.from_state(state[:length])
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+def test_bit_flipped_state(name):
+    state = get_algorithm(name)(MESSAGE[:70]).export_state()
+    for bit in range(len(state) * 8):
+        corrupted = bytearray(state)
+        corrupted[bit // 8] ^= 1 << (bit % 8)
+        with pytest.raises(ValueError):
+            Hash.from_state(corrupted)
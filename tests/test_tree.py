@@ -0,0 +1,25 @@
+# tests.test_tree.py
+# CodeWriter21
+
+import pytest
+
+from cryptwentyone.Hash import tree_hash, leaf_digests, tree_root
+
+
+def test_known_answer():
+    # Leaves 'abcd', 'efgh' and 'ij': the odd third leaf moves up unchanged and is combined with the first node
+    assert tree_hash(b'abcdefghij', 'sha256', leaf_size=4).hex() == \
+        '2a5b33d54d89d05737a7dd798d9862d55951564aafb5460691ad8a7a9ab6c678'
+    # An empty input is a single empty leaf: SHA256(0x00)
+    assert tree_hash(b'', 'sha256', leaf_size=4).hex() == \
+        '6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d'
+
+
+@pytest.mark.parametrize('size', [0, 1, 1000, 1024, 5000, 7 * 1024 + 3])
+def test_file_and_bytes_agree(tmp_path, size):
+    data = bytes(i * 31 % 251 for i in range(size))
+    path = tmp_path / 'data'
+    path.write_bytes(data)
+    root = tree_hash(path, 'sha256', leaf_size=1024, workers=2)
+    assert root == tree_hash(data, 'sha256', leaf_size=1024, workers=1)
+    assert root == tree_root(leaf_digests(data, 'sha256', leaf_size=1024, workers=1), 'sha256')
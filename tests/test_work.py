@@ -0,0 +1,56 @@
+# tests.test_work.py
+# CodeWriter21
+
+import hashlib as _hashlib
+
+import pytest
+
+from cryptwentyone.Hash import solve_nonce, verify_nonce
+from cryptwentyone.Hash.Hash import _algorithms, get_algorithm
+from cryptwentyone.Hash.Work import leading_zero_bits
+
+ALGORITHMS = sorted(_algorithms)
+DIFFICULTY = 5
+
+
+def _brute_force(name: str, header: bytes, difficulty: int, nonce_size: int):
+    byteorder = get_algorithm(name).length_byteorder
+    for nonce in range(1 << (8 * nonce_size)):
+        digest = _hashlib.new(name, header + nonce.to_bytes(nonce_size, byteorder)).digest()
+        if leading_zero_bits(digest) >= difficulty:
+            return nonce
+    return None
+
+
+def _header_lengths(name: str):
+    # Every alignment of the nonce in the first words, and the lengths where the nonce and the padding need an extra
+    # block or the nonce crosses the end of the first block
+    block_size = get_algorithm(name).block_size
+    return list(range(0, 9)) + list(range(block_size - block_size // 8 - 8 - 9, block_size + 1))
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+@pytest.mark.parametrize('nonce_size', [1, 4, 8])
+def test_solve_nonce(name, nonce_size):
+    for length in _header_lengths(name):
+        header = bytes(range(length))
+        expected = _brute_force(name, header, DIFFICULTY, nonce_size)
+        nonce = solve_nonce(header, DIFFICULTY, name, nonce_size, workers=1)
+        assert nonce == expected, length
+        if nonce is not None:
+            assert verify_nonce(header, nonce, DIFFICULTY, name, nonce_size)
+            if nonce:
+                assert not verify_nonce(header, nonce - 1, DIFFICULTY, name, nonce_size)
+
+
+@pytest.mark.parametrize('name', ALGORITHMS)
+def test_solve_nonce_difficulty_zero_and_range(name):
+    assert solve_nonce(b'header', 0, name, workers=1) == 0
+    assert solve_nonce(b'header', 0, name, start=10, workers=1) == 10
+    expected = _brute_force(name, b'header', DIFFICULTY, 4)
+    assert solve_nonce(b'header', DIFFICULTY, name, 4, start=0, stop=expected, workers=1) is None
+
+
+def test_verify_nonce_rejects_out_of_range():
+    assert not verify_nonce(b'header', -1, 0, nonce_size=1)
+    assert not verify_nonce(b'header', 256, 0, nonce_size=1)